@@ -0,0 +1,218 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+from contextlib import contextmanager
+from logger import app_logger
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows, where only the grace period protects new blobs
+    fcntl = None
+
+BLOB_GRACE_PERIOD = 3600  # Seconds a blob is kept after it was last stored, so it can be recorded in a snapshot
+
+
+class BackupStore:
+    """
+    A content-addressed backup store.
+    File contents are stored once per sha256 digest under blobs/, and each snapshot is a small
+    JSON manifest under snapshots/ that maps file names to the digests they had at that time.
+    """
+
+    def __init__(self, root, keep_versions=5, gc_every=20, grace_period=BLOB_GRACE_PERIOD):
+        """
+        Initialize the BackupStore.
+        :param root: Directory holding the blobs and snapshot manifests.
+        :param keep_versions: Number of distinct versions kept per file by garbage collection.
+        :param gc_every: Run garbage collection automatically after this many snapshots. 0 disables it.
+        :param grace_period: Seconds after a blob was last stored during which garbage collection keeps it,
+            because another process may not have recorded its snapshot yet.
+        """
+        self.root = root
+        self.blobs_dir = os.path.join(root, "blobs")
+        self.snapshots_dir = os.path.join(root, "snapshots")
+        self.keep_versions = keep_versions
+        self.gc_every = gc_every
+        self.grace_period = grace_period
+        self._snapshots_since_gc = 0
+        self._lock = threading.Lock()  # Serializes snapshot ids and garbage collection
+        self._counter = 0
+
+    @contextmanager
+    def _store_lock(self, exclusive):
+        """
+        Hold the lock file shared by every process using this store.
+        Snapshot writers hold it shared; garbage collection holds it exclusively.
+        :param exclusive: Take the lock exclusively.
+        """
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, ".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def blob_path(self, digest):
+        """
+        Return the path of the blob for a digest, fanned out by its first two characters.
+        :param digest: sha256 hex digest.
+        :return: The blob path.
+        """
+        return os.path.join(self.blobs_dir, digest[:2], digest)
+
+    def store_blob(self, file_path, digest=None):
+        """
+        Store the content of a file as a blob unless a blob with the same content already exists.
+        :param file_path: Path to the file to back up.
+        :param digest: The file's sha256 digest if already known. Known content is not read again.
+        :return: The digest of the stored content, or None if the file changed while it was copied.
+        """
+        if digest:
+            try:
+                # Identical content is stored once; touching it restarts its grace period
+                os.utime(self.blob_path(digest))
+                return digest
+            except FileNotFoundError:
+                pass
+        os.makedirs(self.blobs_dir, exist_ok=True)
+        temp_path = os.path.join(self.blobs_dir, f".{os.getpid()}-{threading.get_ident()}.tmp")
+        hasher = hashlib.sha256()
+        with open(file_path, "rb") as source, open(temp_path, "wb") as target:
+            for chunk in iter(lambda: source.read(64 * 1024), b""):
+                hasher.update(chunk)
+                target.write(chunk)
+        actual = hasher.hexdigest()
+        if digest and actual != digest:
+            os.remove(temp_path)
+            app_logger.log_warning(f"{file_path} changed while it was backed up. Skipping.", context="BackupStore")
+            return None
+        os.makedirs(os.path.dirname(self.blob_path(actual)), exist_ok=True)
+        os.replace(temp_path, self.blob_path(actual))
+        return actual
+
+    def record_snapshot(self, files):
+        """
+        Write a snapshot manifest.
+        :param files: A dictionary mapping file names to the digests of their stored blobs.
+        :return: The snapshot id.
+        """
+        os.makedirs(self.snapshots_dir, exist_ok=True)
+        with self._lock:
+            self._counter += 1
+            snapshot_id = f"{time.time_ns():020d}-{os.getpid()}-{self._counter}"
+            self._snapshots_since_gc += 1
+            run_gc = self.gc_every and self._snapshots_since_gc >= self.gc_every
+        with self._store_lock(exclusive=False):
+            self._write_manifest(snapshot_id, {"created": time.time(), "files": files})
+        if run_gc:
+            self.garbage_collect()
+        return snapshot_id
+
+    def _write_manifest(self, snapshot_id, manifest):
+        path = os.path.join(self.snapshots_dir, f"{snapshot_id}.json")
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(manifest, f)
+        os.replace(f"{path}.tmp", path)
+
+    def snapshots(self):
+        """
+        Load all snapshot manifests.
+        :return: A list of (snapshot_id, manifest) tuples, newest first.
+        """
+        if not os.path.isdir(self.snapshots_dir):
+            return []
+        snapshots = []
+        for name in sorted(os.listdir(self.snapshots_dir), reverse=True):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.snapshots_dir, name), "r") as f:
+                    snapshots.append((name[:-len(".json")], json.load(f)))
+            except (json.JSONDecodeError, IOError) as e:
+                app_logger.log_warning(f"Skipping unreadable snapshot {name}: {e}", context="BackupStore")
+        return snapshots
+
+    def versions(self, file_name):
+        """
+        List the distinct backed-up versions of a file.
+        :param file_name: Name of the file as recorded in the snapshots.
+        :return: A list of digests, newest first.
+        """
+        versions = []
+        for _, manifest in self.snapshots():
+            digest = manifest.get("files", {}).get(file_name)
+            if digest and digest not in versions:
+                versions.append(digest)
+        return versions
+
+    def restore(self, file_name, target_path, validate=None):
+        """
+        Restore the newest version of a file whose blob passes validation.
+        :param file_name: Name of the file as recorded in the snapshots.
+        :param target_path: Where to write the restored content.
+        :param validate: Optional callable taking a blob path and returning True if it is usable.
+        :return: The digest of the restored version, or None if no usable version exists.
+        """
+        for digest in self.versions(file_name):
+            blob_path = self.blob_path(digest)
+            if not os.path.exists(blob_path):
+                continue
+            if validate and not validate(blob_path):
+                app_logger.log_warning(f"Skipping invalid backup {digest[:12]} of {file_name}.", context="BackupStore")
+                continue
+            temp_path = f"{target_path}.restore.tmp"
+            shutil.copyfile(blob_path, temp_path)
+            os.replace(temp_path, target_path)
+            return digest
+        return None
+
+    def garbage_collect(self):
+        """
+        Keep the newest keep_versions distinct versions of each file and delete everything else:
+        redundant snapshot entries, empty snapshots and unreferenced blobs.
+        Blobs stored within the grace period are kept, since their snapshot may still be on its way.
+        :return: The number of blobs deleted.
+        """
+        with self._lock, self._store_lock(exclusive=True):
+            self._snapshots_since_gc = 0
+            kept = {}  # File name -> digests kept, newest first
+            for snapshot_id, manifest in self.snapshots():
+                files = manifest.get("files", {})
+                remaining = {}
+                for file_name, digest in files.items():
+                    versions = kept.setdefault(file_name, [])
+                    if digest in versions or len(versions) >= self.keep_versions:
+                        continue  # A newer snapshot already holds this version, or it is too old
+                    versions.append(digest)
+                    remaining[file_name] = digest
+                if not remaining:
+                    os.remove(os.path.join(self.snapshots_dir, f"{snapshot_id}.json"))
+                elif remaining != files:
+                    manifest["files"] = remaining
+                    self._write_manifest(snapshot_id, manifest)
+
+            referenced = {digest for versions in kept.values() for digest in versions}
+            cutoff = time.time() - self.grace_period
+            deleted = 0
+            if os.path.isdir(self.blobs_dir):
+                for dirpath, _, filenames in os.walk(self.blobs_dir):
+                    for name in filenames:
+                        if name.endswith(".tmp") or name in referenced:
+                            continue
+                        path = os.path.join(dirpath, name)
+                        try:
+                            if os.stat(path).st_mtime > cutoff:
+                                continue
+                            os.remove(path)
+                        except FileNotFoundError:
+                            continue
+                        deleted += 1
+        app_logger.log_info(f"Backup garbage collection removed {deleted} blob(s).", context="BackupStore")
+        return deleted
@@ -0,0 +1,246 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+from loguru import logger
+from logger import Logger
+from state_manager import StateManager
+from error_manager import ErrorManager
+from health_check import HealthCheck
+from clock import VirtualClock
+
+# Sizes used by the full suite and by --quick (which the test suite runs)
+STATE_SIZES = (10, 1000, 100000)
+QUICK_STATE_SIZES = (10, 1000)
+HEALTH_FILES = 2000
+QUICK_HEALTH_FILES = 100
+DEFAULT_THRESHOLD = 0.25  # Flag results more than 25% slower than the baseline
+DEFAULT_BASELINE = "benchmark_baseline.json"
+
+BENCHMARKS = {}
+
+
+def benchmark(function):
+    """
+    Register a benchmark. It receives (work_dir, quick) and returns a dictionary
+    mapping result names to (seconds, unit) tuples, e.g. (0.002, "op") for 2 ms per operation.
+    """
+    BENCHMARKS[function.__name__] = function
+    return function
+
+
+def _measure(function, repeat=5):
+    """
+    Run a function several times.
+    :return: The best wall time in seconds. The minimum is the least disturbed by other load on the machine.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _reset_log_sinks():
+    """
+    Remove every loguru sink so a benchmark measures only the sinks it adds.
+    Loggers add their sinks again lazily on their next message.
+    """
+    logger.remove()
+    Logger._sinks.clear()
+
+
+@benchmark
+def state_manager(work_dir, quick):
+    results = {}
+    for size in QUICK_STATE_SIZES if quick else STATE_SIZES:
+        state_manager = StateManager(os.path.join(work_dir, f"state-{size}", "system_state.json"))
+        state_manager.state = {f"key_{i}": {"value": i, "enabled": i % 2 == 0} for i in range(size)}
+        counter = iter(range(10 ** 9))
+        repeat = 3 if size >= 100000 else 10
+        results[f"state_update_{size}"] = (_measure(lambda: state_manager.update_state("counter", next(counter)), repeat), "op")
+        results[f"state_load_{size}"] = (_measure(state_manager.load_state, repeat), "op")
+    return results
+
+
+@benchmark
+def logger_throughput(work_dir, quick):
+    messages = 2000 if quick else 20000
+    results = {}
+    for mode, enqueue in (("sync", False), ("queued", True)):
+        _reset_log_sinks()
+        log = Logger(os.path.join(work_dir, f"{mode}.log"), enqueue=enqueue)
+        log.log_info("warm up", context="Benchmark")
+        start = time.perf_counter()
+        for i in range(messages):
+            log.log_info(f"Benchmark message {i}", context="Benchmark")
+        calls = time.perf_counter() - start
+        logger.complete()  # Wait for the queue to drain
+        total = time.perf_counter() - start
+        results[f"logger_{mode}_call"] = (calls / messages, "msg")
+        results[f"logger_{mode}_total"] = (total / messages, "msg")
+    _reset_log_sinks()
+    return results
+
+
+@benchmark
+def recovery_loop(work_dir, quick):
+    iterations = 200 if quick else 2000
+
+    clock = VirtualClock()  # Measure the loop, not its back-off
+
+    def succeed():
+        error_manager = ErrorManager(clock=clock)
+        for _ in range(iterations):
+            error_manager.recovery_loop(lambda: None, [])
+
+    def recover_once():
+        for _ in range(iterations):
+            attempts = []
+
+            def flaky():
+                attempts.append(1)
+                if len(attempts) == 1:
+                    raise RuntimeError("first attempt fails")
+
+            def noop_step():
+                pass
+
+            ErrorManager(clock=clock).recovery_loop(flaky, [noop_step])
+
+    return {
+        "recovery_loop_success": (_measure(succeed, 3) / iterations, "op"),
+        "recovery_loop_one_retry": (_measure(recover_once, 3) / iterations, "op")
+    }
+
+
+@benchmark
+def health_check(work_dir, quick):
+    file_count = QUICK_HEALTH_FILES if quick else HEALTH_FILES
+    base_dir = os.path.join(work_dir, "health")
+    for i in range(file_count):
+        path = os.path.join(base_dir, "data", f"group_{i % 20}", f"file_{i}.json")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"id": i, "values": list(range(50))}, f)
+    manifest_file = os.path.join(base_dir, "health_check.json")
+    with open(manifest_file, "w") as f:
+        json.dump({"files": [{"pattern": "data/**/*.json", "validator": "json", "recovery_steps": [], "permissions": "644"}]}, f)
+    cache_file = os.path.join(base_dir, "cache.json")
+
+    def cold():
+        if os.path.exists(cache_file):
+            os.remove(cache_file)
+        HealthCheck(base_dir, cache_file=cache_file, manifest_file=manifest_file).run_health_check()
+
+    health_check = HealthCheck(base_dir, cache_file=cache_file, manifest_file=manifest_file)
+    health_check.run_health_check(force=True)
+    return {
+        f"health_check_cold_{file_count}": (_measure(cold, 5), "run"),
+        f"health_check_warm_{file_count}": (_measure(health_check.run_health_check, 5), "run")
+    }
+
+
+def run_benchmarks(names=None, quick=False):
+    """
+    Run benchmarks in a temporary working directory.
+    :param names: Benchmarks to run. Defaults to all of them.
+    :param quick: Use smaller sizes.
+    :return: A dictionary with run metadata and a "results" mapping of result names to {"seconds", "unit"}.
+    """
+    results = {}
+    original_cwd = os.getcwd()
+    work_dir = tempfile.mkdtemp(prefix="benchmarks-")
+    try:
+        os.chdir(work_dir)  # Anything written to relative paths stays in the temporary directory
+        _reset_log_sinks()  # Drop the console sink; the app logger reopens its file under work_dir
+        for name in names or BENCHMARKS:
+            for result_name, (seconds, unit) in BENCHMARKS[name](work_dir, quick).items():
+                results[result_name] = {"seconds": seconds, "unit": unit}
+    finally:
+        os.chdir(original_cwd)
+        _reset_log_sinks()
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return {
+        "created": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": quick,
+        "results": results
+    }
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare a run against a baseline.
+    :param current: The results of run_benchmarks.
+    :param baseline: A previous result of run_benchmarks.
+    :param threshold: Relative slowdown tolerated before a result counts as a regression.
+    :return: A list of (name, baseline seconds, current seconds, ratio, regressed) tuples for results present in both.
+    """
+    rows = []
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous["seconds"]:
+            continue
+        ratio = result["seconds"] / previous["seconds"]
+        rows.append((name, previous["seconds"], result["seconds"], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def format_results(run):
+    """
+    Format the results of a run as a table.
+    """
+    lines = [f"{'benchmark':<32} {'time':>14}"]
+    for name, result in run["results"].items():
+        lines.append(f"{name:<32} {result['seconds'] * 1e6:>11.2f} us/{result['unit']}")
+    return "\n".join(lines)
+
+
+def format_comparison(rows, threshold):
+    """
+    Format the rows returned by compare as a table, flagging regressions.
+    """
+    lines = [f"{'benchmark':<32} {'baseline us':>12} {'current us':>12} {'change':>8}"]
+    for name, previous, current, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        lines.append(f"{name:<32} {previous * 1e6:>12.2f} {current * 1e6:>12.2f} {ratio - 1:>+8.1%}{flag}")
+    regressions = sum(1 for row in rows if row[4])
+    lines.append(f"{regressions} regression(s) beyond {threshold:.0%}.")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    Run the benchmarks and either write a new baseline or compare against an existing one.
+    :return: The process exit code, 1 if a regression was found.
+    """
+    parser = argparse.ArgumentParser(description="Run the performance benchmarks.")
+    parser.add_argument("--quick", action="store_true", help="Use smaller sizes")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Benchmarks to run")
+    parser.add_argument("--output", default=DEFAULT_BASELINE, help="Where to write the results")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare against a previous results file instead of overwriting it")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Relative slowdown counted as a regression")
+    args = parser.parse_args(argv)
+
+    run = run_benchmarks(args.only, quick=args.quick)
+    print(format_results(run))
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        rows = compare(run, baseline, args.threshold)
+        print(format_comparison(rows, args.threshold))
+        return 1 if any(row[4] for row in rows) else 0
+    with open(args.output, "w") as f:
+        json.dump(run, f, indent=4)
+    print(f"Wrote {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
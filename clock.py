@@ -0,0 +1,59 @@
+import time
+import threading
+
+
+class SystemClock:
+    """
+    The real clock. Managers take a clock so tests can substitute a VirtualClock.
+    """
+
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.perf_counter()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+class VirtualClock:
+    """
+    A simulated clock. sleep() advances virtual time instantly, so recovery back-offs
+    and injected latencies cost nothing in wall time and runs are deterministic.
+    """
+
+    def __init__(self, start=0.0):
+        """
+        Initialize the VirtualClock.
+        :param start: The initial virtual time in seconds.
+        """
+        self.now = start
+        self.sleeps = []  # Every sleep requested, in order
+        self._lock = threading.Lock()
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        """
+        Advance virtual time without blocking.
+        :param seconds: How far to advance.
+        """
+        with self._lock:
+            self.sleeps.append(seconds)
+            self.now += seconds
+
+    def advance(self, seconds):
+        """
+        Advance virtual time without recording a sleep, e.g. to simulate work taking time.
+        :param seconds: How far to advance.
+        """
+        with self._lock:
+            self.now += seconds
+
+# Global instance of the SystemClock
+system_clock = SystemClock()
@@ -0,0 +1,149 @@
+import os
+import json
+import shlex
+import importlib
+from logger import app_logger
+
+
+class CommandError(Exception):
+    """
+    Raised when a command cannot be resolved or loaded.
+    """
+
+
+class CommandRegistry:
+    """
+    A dispatch table of REPL commands.
+    Plugin commands are listed in a manifest and their modules are imported only when first invoked.
+    """
+
+    def __init__(self):
+        self.commands = {}  # Command name -> entry
+        self.aliases = {}  # Alias -> command name
+
+    def register(self, name, handler=None, target=None, aliases=(), help_text="", locks=(), idempotent=False, inputs=()):
+        """
+        Register a command.
+        :param name: The command name.
+        :param handler: Callable taking (profile, *args). Either this or target is required.
+        :param target: "module:function" to import lazily on first use.
+        :param aliases: Alternative names for the command.
+        :param help_text: One-line description shown by "help".
+        :param locks: Names of shared resources (e.g. "npm"); background jobs holding the same lock never overlap.
+        :param idempotent: The command has no side effects, so its result may be reused while its inputs are unchanged.
+        :param inputs: Files (paths or glob patterns relative to the base directory) an idempotent command reads.
+        """
+        if handler is None and target is None:
+            raise ValueError(f"Command {name} needs a handler or a target.")
+        self.commands[name] = {
+            "name": name,
+            "handler": handler,
+            "target": target,
+            "aliases": list(aliases),
+            "help": help_text,
+            "locks": list(locks),
+            "idempotent": idempotent,
+            "inputs": list(inputs)
+        }
+        for alias in aliases:
+            self.aliases[alias] = name
+
+    def load_manifest(self, manifest_path):
+        """
+        Register the plugin commands listed in a manifest without importing them.
+        :param manifest_path: Path to a JSON file with a "commands" list of
+            {"name", "target", "aliases", "help", "locks", "idempotent", "inputs"} entries.
+        :return: The number of commands registered.
+        """
+        if not os.path.exists(manifest_path):
+            return 0
+        try:
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            app_logger.log_error(f"Failed to load command manifest {manifest_path}: {e}", context="CommandRegistry")
+            return 0
+        count = 0
+        for entry in manifest.get("commands", []):
+            try:
+                self.register(entry["name"], target=entry["target"], aliases=entry.get("aliases", ()),
+                              help_text=entry.get("help", ""), locks=entry.get("locks", ()),
+                              idempotent=entry.get("idempotent", False), inputs=entry.get("inputs", ()))
+                count += 1
+            except (KeyError, ValueError) as e:
+                app_logger.log_error(f"Invalid command entry {entry}: {e}", context="CommandRegistry")
+        return count
+
+    def resolve(self, word):
+        """
+        Resolve a command name, alias or unique prefix of either.
+        :param word: What the user typed.
+        :return: The command name.
+        Raises CommandError if the word is unknown or ambiguous.
+        """
+        if word in self.commands:
+            return word
+        if word in self.aliases:
+            return self.aliases[word]
+        matches = sorted({name for name in self.commands if name.startswith(word)}
+                         | {name for alias, name in self.aliases.items() if alias.startswith(word)})
+        if len(matches) == 1:
+            return matches[0]
+        if matches:
+            raise CommandError(f"Ambiguous command '{word}': {', '.join(matches)}")
+        raise CommandError(f"Unknown command '{word}'. Type 'help' for a list of commands.")
+
+    def load(self, name):
+        """
+        Return the handler of a command, importing its module on first use.
+        :param name: The command name.
+        :return: The handler callable.
+        """
+        entry = self.commands[name]
+        if entry["handler"] is None:
+            module_name, _, function_name = entry["target"].partition(":")
+            try:
+                module = importlib.import_module(module_name)
+                entry["handler"] = getattr(module, function_name)
+            except (ImportError, AttributeError) as e:
+                raise CommandError(f"Failed to load command '{name}' from {entry['target']}: {e}")
+            app_logger.log_info(f"Loaded command '{name}' from {entry['target']}", context="CommandRegistry")
+        return entry["handler"]
+
+    def parse(self, line):
+        """
+        Split a command line and resolve its command name.
+        :param line: The command line, e.g. "state initialized".
+        :return: A (name, args) tuple, or (None, []) for an empty line.
+        """
+        try:
+            words = shlex.split(line)
+        except ValueError as e:
+            raise CommandError(f"Cannot parse command: {e}")
+        if not words:
+            return None, []
+        return self.resolve(words[0]), words[1:]
+
+    def dispatch(self, line, profile=None):
+        """
+        Parse a command line and run the matching command.
+        :param line: The command line, e.g. "state initialized".
+        :param profile: Passed to the handler as its first argument.
+        :return: Whatever the handler returns, or None for an empty line.
+        """
+        name, args = self.parse(line)
+        if name is None:
+            return None
+        return self.load(name)(profile, *args)
+
+    def help_text(self):
+        """
+        Describe all registered commands.
+        :return: One line per command, sorted by name.
+        """
+        lines = []
+        for name in sorted(self.commands):
+            entry = self.commands[name]
+            aliases = f" ({', '.join(entry['aliases'])})" if entry["aliases"] else ""
+            lines.append(f"{name}{aliases} - {entry['help']}")
+        return "\n".join(lines)
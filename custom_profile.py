@@ -1,6 +1,12 @@
 import os
 import sys
+import json
+import time
 from loguru import logger
+from command_registry import CommandRegistry, CommandError
+from job_manager import JobManager
+from result_cache import ResultCache, file_fingerprint
+from startup_profile import startup_profiler
 
 class CustomProfile:
     """
@@ -8,9 +14,17 @@ class CustomProfile:
     This class initializes the logger and provides the main execution flow.
     """
 
-    def __init__(self):
+    def __init__(self, base_dir=None):
+        self.base_dir = base_dir or os.path.dirname(os.path.abspath(__file__))
         # Initialize loggers
-        self._setup_loggers()
+        with startup_profiler.phase("sink setup"):
+            self._setup_loggers()
+        with startup_profiler.phase("command registry"):
+            self.registry = self._setup_commands()
+        self.results = ResultCache()
+        self.history = None  # Loaded when the interactive loop starts
+        self.jobs = JobManager(self.execute, os.path.join(self.base_dir, "logs", "jobs"), locks_for=self._locks_for)
+        self.jobs.register_commands(self.registry)
         logger.info("Custom profile initialized successfully.")
 
     def _setup_loggers(self):
@@ -23,6 +37,75 @@ class CustomProfile:
         logger.add(log_file_path, rotation="1 MB", level="INFO", backtrace=True, diagnose=True)
         logger.info("Loguru logger setup complete.")
 
+    def _setup_commands(self):
+        """
+        Build the command registry from the built-in commands and the plugin manifest in src/.
+        Plugin modules are not imported until their command is first used.
+        """
+        registry = CommandRegistry()
+        registry.register("help", handler=lambda profile: profile.registry.help_text(), aliases=["?"], help_text="List the available commands")
+        registry.register("history", handler=lambda profile, count=20: profile._show_history(count), help_text="Show recent commands")
+        registry.register("cache", handler=lambda profile, action=None: profile._cache_command(action),
+                          help_text="Show result cache statistics, or drop cached results with 'cache clear'")
+        count = registry.load_manifest(os.path.join(self.base_dir, "src", "commands.json"))
+        logger.info(f"Registered {count} plugin commands.")
+        return registry
+
+    def execute(self, command):
+        """
+        Dispatch a single command line to its handler.
+        A trailing '&' runs the command as a background job instead. A command run here
+        waits for background jobs holding the same resource locks.
+        Results of idempotent commands are reused until one of their input files changes.
+        :param command: The command line entered by the user.
+        :return: The command's output, or None if it has none.
+        """
+        logger.info(f"Received command: {command}")
+        if command.rstrip().endswith("&"):
+            job = self.jobs.submit(command.rstrip()[:-1].rstrip())
+            return f"Started job {job.id}"
+        name, args = self.registry.parse(command)
+        if name is None:
+            return None
+        entry = self.registry.commands[name]
+        # Foreground commands take the same resource locks as background jobs
+        with self.jobs.locked(command):
+            if not entry["idempotent"]:
+                return self.registry.load(name)(self, *args)
+            key = (name, tuple(args), file_fingerprint(self.base_dir, entry["inputs"]))
+            hit, result = self.results.lookup(key)
+            if not hit:
+                result = self.registry.load(name)(self, *args)
+                self.results.put(key, result)
+            return result
+
+    def _show_history(self, count):
+        if self.history is None:
+            return "History is only kept in interactive mode."
+        return "\n".join(self.history.recent(count))
+
+    def _cache_command(self, action):
+        if action == "clear":
+            self.results.clear()
+            return "Result cache cleared."
+        stats = self.results.stats()
+        return (f"{stats['entries']} cached result(s), {stats['hits']} hit(s), {stats['misses']} miss(es), "
+                f"hit rate {stats['hit_rate']:.1%}, {stats['evictions']} eviction(s)")
+
+    def _locks_for(self, command):
+        """
+        Look up the shared-resource locks a command declares.
+        :param command: The command line.
+        :return: A list of lock names.
+        """
+        words = command.split()
+        if not words:
+            return []
+        try:
+            return self.registry.commands[self.registry.resolve(words[0])]["locks"]
+        except CommandError:
+            return []
+
     def run(self):
         """
         Entry point to execute the profile setup and main tasks.
@@ -41,20 +124,124 @@ class CustomProfile:
         """
         Main loop for processing commands or actions.
         """
+        from repl_history import CommandHistory  # Imports readline, which batch mode never needs
+        self.history = CommandHistory(os.path.join(self.base_dir, "logs", "repl_history"))
         while True:
             try:
                 user_input = input("Enter a command (or 'exit' to quit): ")
+                self.history.append(user_input)
                 if user_input.lower() == 'exit':
                     logger.info("Exiting the custom profile.")
                     print("Goodbye!")
                     break
                 else:
-                    logger.info(f"Received command: {user_input}")
-                    print(f"Command '{user_input}' received and processed.")
-            except KeyboardInterrupt:
+                    output = self.execute(user_input)
+                    if output is not None:
+                        print(output)
+            except CommandError as e:
+                logger.warning(str(e))
+                print(e)
+            except (EOFError, KeyboardInterrupt):
                 logger.info("Custom profile interrupted by user.")
                 print("\nInterrupted. Exiting gracefully.")
                 break
+            except Exception as e:
+                logger.error(f"Command failed: {e}")
+                print(f"Error: {e}")
+        running = [job for job in self.jobs.jobs.values() if job.status == "running"]
+        if running:
+            print(f"Waiting for {len(running)} running job(s) to finish...")
+        self.jobs.shutdown()
+
+    def run_batch(self, stream, output=None, json_lines=False, fail_fast=False, buffer_size=64 * 1024):
+        """
+        Run commands from a stream without prompting.
+        Output is buffered and written in blocks, so throughput is bound by the commands, not the terminal.
+        :param stream: An iterable of command lines (e.g. an open file or sys.stdin).
+        :param output: Where results are written. Defaults to sys.stdout.
+        :param json_lines: Write one JSON object per command result instead of plain text.
+        :param fail_fast: Stop at the first failing command instead of continuing.
+        :param buffer_size: Characters to buffer before writing to the output.
+        :return: 0 if every command succeeded, 1 otherwise.
+        """
+        output = output or sys.stdout
+        buffer = []
+        buffered = 0
+        timings = {}  # Command name -> [count, failures, total seconds, max seconds]
+        failures = 0
+        executed = 0
+        logger.info("CustomProfile is running in batch mode.")
+
+        for line_number, line in enumerate(stream, 1):
+            command = line.strip()
+            if not command or command.startswith("#"):
+                continue
+            if command.lower() == "exit":
+                break
+            start = time.perf_counter()
+            try:
+                result = self.execute(command)
+                error = None
+            except Exception as e:
+                result = None
+                error = str(e)
+                logger.warning(f"Batch command failed at line {line_number}: {error}")
+            elapsed = time.perf_counter() - start
+            executed += 1
+
+            name = command.split()[0]
+            try:
+                name = self.registry.resolve(name)
+            except CommandError:
+                pass
+            timing = timings.setdefault(name, [0, 0, 0.0, 0.0])
+            timing[0] += 1
+            timing[2] += elapsed
+            timing[3] = max(timing[3], elapsed)
+            if error is not None:
+                timing[1] += 1
+                failures += 1
+
+            if json_lines:
+                text = json.dumps({"line": line_number, "command": command, "ok": error is None,
+                                   "output": result, "error": error, "seconds": round(elapsed, 6)}, default=str) + "\n"
+            elif error is not None:
+                text = f"[line {line_number}] error: {error}\n"
+            elif result is not None:
+                text = f"{result}\n"
+            else:
+                text = ""
+            buffer.append(text)
+            buffered += len(text)
+            if buffered >= buffer_size:
+                output.write("".join(buffer))
+                buffer = []
+                buffered = 0
+            if error is not None and fail_fast:
+                break
+
+        output.write("".join(buffer))
+        self._write_batch_summary(output if json_lines else sys.stderr, timings, executed, failures, json_lines)
+        output.flush()
+        return 1 if failures else 0
+
+    def _write_batch_summary(self, output, timings, executed, failures, json_lines):
+        """
+        Write the end-of-run summary with per-command timing.
+        """
+        commands = {
+            name: {"count": count, "failures": failed, "total_seconds": round(total, 6),
+                   "mean_seconds": round(total / count, 6), "max_seconds": round(longest, 6)}
+            for name, (count, failed, total, longest) in sorted(timings.items())
+        }
+        if json_lines:
+            output.write(json.dumps({"summary": {"executed": executed, "failures": failures, "commands": commands}}) + "\n")
+            return
+        lines = [f"Batch complete: {executed} command(s), {failures} failure(s)."]
+        for name, stats in commands.items():
+            lines.append(f"  {name}: {stats['count']} run(s), {stats['failures']} failed, "
+                         f"total {stats['total_seconds']:.6f}s, mean {stats['mean_seconds']:.6f}s, max {stats['max_seconds']:.6f}s")
+        output.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
@@ -1,7 +1,11 @@
 import os
 import subprocess
 from logger import Logger
-from error_manager import ErrorManager
+from error_manager import ErrorManager, NPM_INSTALL_TIMEOUT
+from tracing import tracer
+from process_runner import default_runner
+
+VERSION_CHECK_TIMEOUT = 30  # Seconds allowed for "node -v" and similar probes
 
 class EnvironmentManager:
     """
@@ -9,19 +13,25 @@ class EnvironmentManager:
     and dependency installations.
     """
 
-    def __init__(self, base_dir, logger, error_manager):
+    def __init__(self, base_dir, logger, error_manager, runner=None):
         """
         Initialize the EnvironmentManager with the project directory, logger, and error manager.
+        :param runner: Runs subprocesses. Defaults to the error manager's runner, so one FaultInjector scripts both.
         """
         self.base_dir = base_dir
         self.logger = logger
         self.error_manager = error_manager
+        self.runner = runner or getattr(error_manager, "runner", None) or default_runner
         self.directories = ["logs", "src", "build", "configs"]
+        self.last_error = None  # Why the last setup failed, for callers that report it
 
-    def setup_environment(self):
+    def setup_environment(self, check_versions=True):
         """
         Perform the full environment setup process.
+        :param check_versions: Probe the Node.js, npm and Python versions. Fleet runs probe once for all projects instead.
+        :return: True if the setup completed, False if it failed. The cause of a failure is kept in last_error.
         """
+        self.last_error = None
         try:
             self.logger.log_info("Starting environment setup...", context="EnvironmentManager")
 
@@ -29,20 +39,28 @@ class EnvironmentManager:
             self._create_directories()
 
             # Step 2: Check Node.js, npm, and Python versions
-            self._check_versions()
+            if check_versions:
+                self._check_versions()
 
             # Step 3: Install dependencies if necessary
             self._install_dependencies()
 
             self.logger.log_info("Environment setup complete.", context="EnvironmentManager")
             print("Environment setup complete.")
+            return True
 
         except Exception as e:
+            self.last_error = str(e)
             self.logger.log_error(f"Environment setup failed: {e}", context="EnvironmentManager")
-            self.error_manager.handle_error(
-                failing_command=lambda: None,
-                error_type="setup_failure"
-            )
+            try:
+                self.error_manager.handle_error(
+                    failing_command=lambda: None,
+                    error_type="setup_failure"
+                )
+            except Exception as recovery_error:
+                # There are no recovery steps for a failed setup; keep the original cause rather than this error
+                self.logger.log_error(f"Recovery after the failed setup did not run: {recovery_error}", context="EnvironmentManager")
+            return False
 
     def _create_directories(self):
         """
@@ -83,12 +101,7 @@ class EnvironmentManager:
             self.logger.log_info("package.json found. Checking dependencies...", context="EnvironmentManager")
             if not os.path.exists(node_modules_path):
                 self.logger.log_info("Installing npm dependencies...", context="EnvironmentManager")
-                result = subprocess.run(
-                    ["npm", "install"],
-                    cwd=self.base_dir,
-                    capture_output=True,
-                    text=True,
-                )
+                result = self.runner.run(["npm", "install"], cwd=self.base_dir, timeout=NPM_INSTALL_TIMEOUT)
                 if result.returncode == 0:
                     self.logger.log_info("Dependencies installed successfully.", context="EnvironmentManager")
                 else:
@@ -107,9 +120,10 @@ class EnvironmentManager:
         :return: The output of the command.
         """
         try:
-            result = subprocess.run(command, cwd=self.base_dir, capture_output=True, text=True, check=True)
+            with tracer.span("EnvironmentManager._run_command", command=command):
+                result = self.runner.run(command, cwd=self.base_dir, check=True, timeout=VERSION_CHECK_TIMEOUT)
             return result.stdout.strip()
-        except subprocess.CalledProcessError:
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
             self.logger.log_error(error_message, context="EnvironmentManager")
             raise Exception(error_message)
 
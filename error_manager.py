@@ -1,12 +1,35 @@
 import json
 import subprocess
 import shutil
-import time
 import os
 from logger import app_logger
+from metrics import app_metrics
+from tracing import tracer
+from clock import system_clock
+from process_runner import default_runner
+
+NPM_INSTALL_TIMEOUT = 1800  # Seconds allowed for "npm install"
+
+def record_recovery_step(step_name, outcome, seconds):
+    """
+    Record the outcome and duration of a recovery step in the metrics registry.
+    :param step_name: Name of the recovery step.
+    :param outcome: "success" or "failure".
+    :param seconds: How long the step took.
+    """
+    app_metrics.inc("recovery_steps_total", help_text="Recovery steps executed", step=step_name, outcome=outcome)
+    app_metrics.observe("recovery_step_seconds", seconds, help_text="Duration of recovery steps", step=step_name)
 
 class ErrorManager:
-    def __init__(self):
+    def __init__(self, clock=None, runner=None, base_dir=None):
+        """
+        :param clock: Clock used for back-off sleeps and step timing. Pass a VirtualClock to simulate time.
+        :param runner: Runs subprocesses. Pass a FaultInjector to script their results.
+        :param base_dir: Project directory the recovery steps work in. Defaults to the current directory.
+        """
+        self.clock = clock or system_clock
+        self.runner = runner or default_runner
+        self.base_dir = base_dir
         self.recovery_step_status = {}  # Track status of recovery steps
 
     def handle_error(self, failing_command, error_type):
@@ -44,7 +67,7 @@ class ErrorManager:
         elif error_type == "network_error":
             recovery_steps = [self.wait_for_network]
         elif error_type == "permission_error":
-            recovery_steps = [lambda: self.check_permissions("package.json")]
+            recovery_steps = [lambda: self.check_permissions(self._path("package.json"))]
         elif error_type == "runtime_exception":  # New error type
             recovery_steps = [self.handle_runtime_exception]
 
@@ -58,33 +81,42 @@ class ErrorManager:
         :return: True if the command succeeds, False otherwise.
         """
         for attempt in range(3):
-            try:
-                app_logger.log_info(f"Attempt {attempt + 1} to execute the command.")
-                failing_command()
-                app_logger.log_info("Command executed successfully.")
-                return True  # Return True if the command succeeds
-            except Exception as e:
-                app_logger.log_error(f"Attempt {attempt + 1} failed: {e}")
-                for step in recovery_steps:
-                    step_name = step.__name__ if hasattr(step, '__name__') else str(step)
-                    if step_name not in self.recovery_step_status or not self.recovery_step_status[step_name]:
-                        try:
-                            app_logger.log_info(f"Executing recovery step: {step_name}")
-                            step()
-                            self.recovery_step_status[step_name] = True  # Mark step as successful
-                            # Check if the recovery step resolved the issue
-                            if self.is_issue_resolved():
-                                app_logger.log_info("Issue resolved after recovery step.")
-                                return True
-                        except Exception as recovery_error:
-                            app_logger.log_error(f"Recovery step failed: {recovery_error}")
-                            self.recovery_step_status[step_name] = False  # Mark step as failed
-                    else:
-                        app_logger.log_info(f"Skipping recovery step: {step_name} (already executed successfully)")
-                app_logger.log_info("Retrying...")
-                time.sleep(2)
+            with tracer.span("ErrorManager.recovery_attempt", attempt=attempt + 1):
+                try:
+                    app_logger.log_info(f"Attempt {attempt + 1} to execute the command.")
+                    app_metrics.inc("recovery_attempts_total", help_text="Attempts made by recovery loops")
+                    failing_command()
+                    app_logger.log_info("Command executed successfully.")
+                    app_metrics.inc("recovery_loops_total", help_text="Completed recovery loops", outcome="success")
+                    return True  # Return True if the command succeeds
+                except Exception as e:
+                    app_logger.log_error(f"Attempt {attempt + 1} failed: {e}")
+                    for step in recovery_steps:
+                        step_name = step.__name__ if hasattr(step, '__name__') else str(step)
+                        if step_name not in self.recovery_step_status or not self.recovery_step_status[step_name]:
+                            start = self.clock.monotonic()
+                            try:
+                                with tracer.span(f"ErrorManager.recovery_step:{step_name}"):
+                                    app_logger.log_info(f"Executing recovery step: {step_name}")
+                                    step()
+                                self.recovery_step_status[step_name] = True  # Mark step as successful
+                                record_recovery_step(step_name, "success", self.clock.monotonic() - start)
+                                # Check if the recovery step resolved the issue
+                                if self.is_issue_resolved():
+                                    app_logger.log_info("Issue resolved after recovery step.")
+                                    app_metrics.inc("recovery_loops_total", help_text="Completed recovery loops", outcome="success")
+                                    return True
+                            except Exception as recovery_error:
+                                app_logger.log_error(f"Recovery step failed: {recovery_error}")
+                                self.recovery_step_status[step_name] = False  # Mark step as failed
+                                record_recovery_step(step_name, "failure", self.clock.monotonic() - start)
+                        else:
+                            app_logger.log_info(f"Skipping recovery step: {step_name} (already executed successfully)")
+                    app_logger.log_info("Retrying...")
+            self.clock.sleep(2)
 
         app_logger.log_error("All recovery attempts failed.")
+        app_metrics.inc("recovery_loops_total", help_text="Completed recovery loops", outcome="failure")
         return False  # Return False if all attempts fail
 
     def is_issue_resolved(self):
@@ -94,15 +126,24 @@ class ErrorManager:
         """
         # Placeholder logic to check if the issue is resolved
         # For example, check if a specific condition is met
-        return os.path.exists("temp_runtime_exception.txt")
+        return os.path.exists(self._path("temp_runtime_exception.txt"))
+
+    def _path(self, name):
+        """
+        Resolve a project file against base_dir.
+        :param name: The file name, relative to the project.
+        :return: The path.
+        """
+        return os.path.join(self.base_dir, name) if self.base_dir else name
 
     def create_package_json(self):
         """
         Creates a package.json file with a minimal valid JSON structure if it doesn't already exist.
         """
-        if not os.path.exists("package.json"):
+        package_json = self._path("package.json")
+        if not os.path.exists(package_json):
             app_logger.log_info("Creating package.json...")
-            with open("package.json", "w") as f:
+            with open(package_json, "w") as f:
                 json.dump({"name": "project", "version": "1.0.0"}, f, indent=4)
         else:
             app_logger.log_info("package.json already exists. Skipping creation.")
@@ -113,8 +154,8 @@ class ErrorManager:
         """
         app_logger.log_info("Rebuilding npm cache...")
         try:
-            subprocess.run(["npm", "cache", "clean", "--force"], check=True)
-        except subprocess.CalledProcessError as e:
+            self.runner.run(["npm", "cache", "clean", "--force"], cwd=self.base_dir, check=True)
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
             app_logger.log_error(f"Failed to rebuild npm cache: {e}")
             raise
 
@@ -124,12 +165,14 @@ class ErrorManager:
         """
         app_logger.log_info("Reinstalling npm dependencies...")
         try:
-            if os.path.exists("package-lock.json"):
-                os.remove("package-lock.json")
-            if os.path.exists("node_modules"):
-                shutil.rmtree("node_modules")
-            subprocess.run(["npm", "install"], check=True)
-        except subprocess.CalledProcessError as e:
+            package_lock = self._path("package-lock.json")
+            node_modules = self._path("node_modules")
+            if os.path.exists(package_lock):
+                os.remove(package_lock)
+            if os.path.exists(node_modules):
+                shutil.rmtree(node_modules)
+            self.runner.run(["npm", "install"], cwd=self.base_dir, check=True, timeout=NPM_INSTALL_TIMEOUT)
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
             app_logger.log_error(f"Failed to reinstall npm dependencies: {e}")
             raise
 
@@ -138,7 +181,7 @@ class ErrorManager:
         Waits for the network to become available.
         """
         app_logger.log_info("Waiting for network...")
-        time.sleep(10)
+        self.clock.sleep(10)
 
     def check_permissions(self, file_path):
         """
@@ -147,8 +190,8 @@ class ErrorManager:
         """
         app_logger.log_info(f"Fixing permissions for: {file_path}")
         try:
-            subprocess.run(["chmod", "u+rw", file_path], check=True)
-        except subprocess.CalledProcessError as e:
+            self.runner.run(["chmod", "u+rw", file_path], cwd=self.base_dir, check=True, timeout=30)
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
             app_logger.log_error(f"Failed to fix permissions for {file_path}: {e}")
             raise
 
@@ -163,7 +206,7 @@ class ErrorManager:
             # Placeholder for actual recovery logic
             # For example, you could reset some state or retry a specific operation
             # Here, we simulate a successful recovery by creating a temporary file
-            temp_file = "temp_runtime_exception.txt"
+            temp_file = self._path("temp_runtime_exception.txt")
             with open(temp_file, "w") as f:
                 f.write("Runtime exception recovery successful.")
             app_logger.log_info(f"Created temporary file: {temp_file}")
@@ -0,0 +1,157 @@
+import random
+import subprocess
+import threading
+from clock import VirtualClock
+
+
+class Fault:
+    """
+    A scripted failure of a subprocess or a callable.
+    """
+
+    def __init__(self, exit_code=1, exception=None, latency=0.0, times=None, probability=1.0, stdout="", stderr=""):
+        """
+        Initialize the Fault.
+        :param exit_code: Exit code reported for a failing subprocess. 0 makes it succeed (useful with latency alone).
+        :param exception: Exception class or instance raised by a failing callable.
+        :param latency: Virtual seconds each matching call takes.
+        :param times: Number of calls that fail before the fault is used up. None fails forever.
+        :param probability: Chance that a matching call fails, for flaky faults. Drawn from the injector's seeded random generator.
+        :param stdout: Output reported by a failing subprocess.
+        :param stderr: Error output reported by a failing subprocess.
+        """
+        self.exit_code = exit_code
+        self.exception = exception
+        self.latency = latency
+        self.remaining = times
+        self.probability = probability
+        self.stdout = stdout
+        self.stderr = stderr
+
+    def active(self):
+        return self.remaining is None or self.remaining > 0
+
+
+class FaultInjector:
+    """
+    A scriptable stand-in for the process runner and for callables such as failing commands and recovery steps.
+    Latencies advance a VirtualClock, so scenarios run in milliseconds and, with a fixed seed, deterministically.
+    """
+
+    def __init__(self, clock=None, seed=0):
+        """
+        Initialize the FaultInjector.
+        :param clock: The VirtualClock advanced by latencies. A new one is created if not given.
+        :param seed: Seed for flaky faults.
+        """
+        self.clock = clock or VirtualClock()
+        self.random = random.Random(seed)
+        self.calls = []  # (kind, name, outcome) for every subprocess and wrapped call
+        self._command_faults = []  # (command prefix, Fault), matched in order
+        self._callable_faults = {}  # Name -> list of Faults
+        self._outputs = []  # (command prefix, stdout, latency) for successful commands
+        self._lock = threading.Lock()
+
+    def fail_command(self, command, exit_code=1, latency=0.0, times=None, probability=1.0, stdout="", stderr=""):
+        """
+        Script failures of a subprocess.
+        :param command: Argument list prefix to match, e.g. ["npm", "install"].
+        :return: The Fault, whose remaining count can be inspected.
+        """
+        fault = Fault(exit_code=exit_code, latency=latency, times=times, probability=probability, stdout=stdout, stderr=stderr)
+        self._command_faults.append((list(command), fault))
+        return fault
+
+    def set_output(self, command, stdout, latency=0.0):
+        """
+        Set the output of a subprocess when it succeeds.
+        :param command: Argument list prefix to match, e.g. ["node", "-v"].
+        :param stdout: The output.
+        :param latency: Virtual seconds the command takes.
+        """
+        self._outputs.append((list(command), stdout, latency))
+
+    def fail_callable(self, name, exception=RuntimeError, latency=0.0, times=None, probability=1.0):
+        """
+        Script failures of a callable returned by wrap().
+        :param name: Name passed to wrap().
+        :param exception: Exception class or instance to raise.
+        :return: The Fault.
+        """
+        fault = Fault(exception=exception, latency=latency, times=times, probability=probability)
+        self._callable_faults.setdefault(name, []).append(fault)
+        return fault
+
+    def _take(self, faults):
+        """
+        Pick the first active fault that fires, using one up.
+        :param faults: Candidate Faults in order.
+        :return: The Fault, or None if the call succeeds.
+        """
+        with self._lock:
+            for fault in faults:
+                if not fault.active():
+                    continue
+                if fault.probability < 1.0 and self.random.random() >= fault.probability:
+                    continue
+                if fault.remaining is not None:
+                    fault.remaining -= 1
+                return fault
+        return None
+
+    def run(self, command, cwd=None, check=False, timeout=None):
+        """
+        Pretend to run a command, following the scripted faults. Matches the ProcessRunner interface.
+        :return: A subprocess.CompletedProcess.
+        Raises subprocess.TimeoutExpired if the command's latency exceeds the timeout.
+        """
+        command = list(command)
+        fault = self._take([fault for prefix, fault in self._command_faults if command[:len(prefix)] == prefix])
+        if fault is not None:
+            latency = fault.latency
+            result = subprocess.CompletedProcess(command, fault.exit_code, fault.stdout, fault.stderr)
+        else:
+            stdout, latency = "", 0.0
+            for prefix, output, output_latency in self._outputs:
+                if command[:len(prefix)] == prefix:
+                    stdout, latency = output, output_latency
+                    break
+            result = subprocess.CompletedProcess(command, 0, stdout, "")
+        if timeout is not None and latency > timeout:
+            self.clock.advance(timeout)
+            self.calls.append(("subprocess", " ".join(command), "timeout"))
+            raise subprocess.TimeoutExpired(command, timeout)
+        self.clock.advance(latency)
+        self.calls.append(("subprocess", " ".join(command), result.returncode))
+        if check and result.returncode != 0:
+            raise subprocess.CalledProcessError(result.returncode, command, result.stdout, result.stderr)
+        return result
+
+    def wrap(self, name, function=None):
+        """
+        Wrap a callable so that the failures scripted for its name are injected.
+        :param name: The name faults are scripted under. Also used as the wrapper's __name__,
+            so ErrorManager tracks the wrapped step under this name.
+        :param function: Called when no fault fires. Defaults to doing nothing.
+        :return: The wrapper.
+        """
+        def wrapper(*args, **kwargs):
+            fault = self._take(self._callable_faults.get(name, []))
+            if fault is not None:
+                self.clock.advance(fault.latency)
+                self.calls.append(("callable", name, "failed"))
+                exception = fault.exception
+                raise exception(f"Injected failure in {name}") if isinstance(exception, type) else exception
+            self.calls.append(("callable", name, "ok"))
+            return function(*args, **kwargs) if function else None
+        wrapper.__name__ = name
+        return wrapper
+
+    def count(self, name, kind=None):
+        """
+        Count the calls made to a command or wrapped callable.
+        :param name: The command line (arguments joined by spaces) or callable name.
+        :param kind: Optionally "subprocess" or "callable".
+        :return: The number of calls.
+        """
+        return sum(1 for call_kind, call_name, _ in self.calls if call_name == name and kind in (None, call_kind))
@@ -0,0 +1,234 @@
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from loguru import logger
+from logger import Logger, app_logger
+from process_runner import default_runner
+
+TOOLCHAIN_PROBES = {
+    "node": ["node", "-v"],
+    "npm": ["npm", "-v"],
+    "python": ["python3", "--version"]
+}
+PROBE_TIMEOUT = 30
+NPM_CACHE_WARM_TIMEOUT = 600
+
+
+def resolve_projects(patterns, marker=None):
+    """
+    Expand project root paths and glob patterns into a list of directories.
+    :param patterns: Paths or glob patterns, e.g. "/srv/checkouts/*".
+    :param marker: Optional file a directory must contain to count as a project, e.g. "package.json".
+    :return: Absolute paths, sorted and without duplicates.
+    """
+    roots = set()
+    for pattern in patterns:
+        for path in glob.glob(os.path.expanduser(pattern)):
+            if os.path.isdir(path) and (marker is None or os.path.exists(os.path.join(path, marker))):
+                roots.add(os.path.abspath(path))
+    return sorted(roots)
+
+
+def probe_toolchain(runner=default_runner):
+    """
+    Probe the tool versions once for the whole fleet.
+    :param runner: Runs the probes.
+    :return: A dictionary mapping tool names to their version, or None if the tool is missing or broken.
+    """
+    versions = {}
+    for name, command in TOOLCHAIN_PROBES.items():
+        try:
+            versions[name] = runner.run(command, check=True, timeout=PROBE_TIMEOUT).stdout.strip()
+        except Exception as e:
+            app_logger.log_warning(f"Toolchain probe {' '.join(command)} failed: {e}", context="Fleet")
+            versions[name] = None
+    return versions
+
+
+def warm_npm_cache(runner=default_runner):
+    """
+    Verify the shared npm cache once, so parallel installs do not all repair it at the same time.
+    :return: True if the cache is usable.
+    """
+    try:
+        runner.run(["npm", "cache", "verify"], check=True, timeout=NPM_CACHE_WARM_TIMEOUT)
+        return True
+    except Exception as e:
+        app_logger.log_warning(f"npm cache warm-up failed: {e}", context="Fleet")
+        return False
+
+
+def route_logs(log_file):
+    """
+    Send this process's log records to a single file, replacing every other sink.
+    The app logger is pointed at the same sink so it does not open its default relative path.
+    :param log_file: The log file.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+    logger.remove()
+    Logger._sinks.clear()
+    Logger._sinks[app_logger.log_file] = logger.add(log_file, rotation="1 MB", retention="10 days", level="DEBUG")
+
+
+def run_project(root, setup=True, health=True, toolchain=None):
+    """
+    Set up and health-check one project. Runs in a worker process.
+    :param root: The project root.
+    :param setup: Run EnvironmentManager.setup_environment.
+    :param health: Run HealthCheck.run_health_check.
+    :param toolchain: Versions probed by the parent, recorded in the project's state.
+    :return: A dictionary with the project's outcome and timings.
+    """
+    from error_manager import ErrorManager
+    from env_manager import EnvironmentManager
+    from health_check import HealthCheck
+    from state_manager import StateManager
+
+    start = time.perf_counter()
+    report = {"root": root, "ok": True, "setup_seconds": None, "health_seconds": None, "failed_files": [], "error": None}
+    try:
+        report["log_file"] = os.path.join(root, "logs", "log_output.log")
+        route_logs(report["log_file"])  # Each project gets its own log
+        app_logger.log_info(f"Fleet run started for {root}", context="Fleet")
+        state_manager = StateManager(os.path.join(root, "logs", "system_state.json"))
+        state_manager.load_state()
+
+        if setup:
+            phase_start = time.perf_counter()
+            env_manager = EnvironmentManager(root, app_logger, ErrorManager(base_dir=root))
+            completed = env_manager.setup_environment(check_versions=False)
+            report["setup_seconds"] = time.perf_counter() - phase_start
+            if completed:
+                state_manager.update_state("initialized", True)
+            else:
+                report["ok"] = False
+                report["error"] = f"Environment setup failed: {env_manager.last_error}"
+
+        if health:
+            phase_start = time.perf_counter()
+            results = HealthCheck(root).run_health_check()
+            report["health_seconds"] = time.perf_counter() - phase_start
+            report["failed_files"] = [name for name, result in results.items() if not result["valid"]]
+            if report["failed_files"]:
+                report["ok"] = False
+
+        if toolchain is not None:
+            state_manager.update_state("toolchain", toolchain)
+        state_manager.update_state("last_fleet_run", {"time": time.time(), "ok": report["ok"]})
+    except Exception as e:
+        report["ok"] = False
+        report["error"] = f"{e.__class__.__name__}: {e}"
+        app_logger.log_error(f"Fleet run failed for {root}:\n{traceback.format_exc()}", context="Fleet")
+    report["seconds"] = time.perf_counter() - start
+    return report
+
+
+def run_fleet(roots, workers=None, setup=True, health=True, warm_cache=True, runner=default_runner):
+    """
+    Run setup and health checks for many projects on a process pool.
+    Toolchain probes and the npm cache warm-up run once in this process before the projects start.
+    :param roots: Project root directories.
+    :param workers: Number of worker processes. Defaults to the CPU count.
+    :param setup: Run the environment setup for each project.
+    :param health: Run the health check for each project.
+    :param warm_cache: Verify the npm cache before running setups.
+    :param runner: Runs the shared probes.
+    :return: The aggregated report.
+    """
+    start = time.perf_counter()
+    toolchain = probe_toolchain(runner)
+    cache_ready = warm_npm_cache(runner) if setup and warm_cache and toolchain.get("npm") else None
+
+    projects = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        futures = {executor.submit(run_project, root, setup, health, toolchain): root for root in roots}
+        for future in as_completed(futures):
+            try:
+                projects.append(future.result())
+            except Exception as e:  # The worker process itself died
+                projects.append({"root": futures[future], "ok": False, "seconds": None, "setup_seconds": None,
+                                 "health_seconds": None, "failed_files": [], "error": f"{e.__class__.__name__}: {e}"})
+    projects.sort(key=lambda project: project["root"])
+
+    durations = [project["seconds"] for project in projects if project["seconds"] is not None]
+    failed = [project["root"] for project in projects if not project["ok"]]
+    report = {
+        "toolchain": toolchain,
+        "npm_cache_warmed": cache_ready,
+        "projects": projects,
+        "summary": {
+            "projects": len(projects),
+            "failed": len(failed),
+            "failed_projects": failed,
+            "wall_seconds": time.perf_counter() - start,
+            "total_project_seconds": sum(durations),
+            "slowest": max(projects, key=lambda project: project["seconds"] or 0)["root"] if projects else None
+        }
+    }
+    app_logger.log_info(f"Fleet run finished: {len(projects)} project(s), {len(failed)} failed.", context="Fleet")
+    return report
+
+
+def format_report(report):
+    """
+    Format the aggregated report as a table.
+    """
+    def seconds(value):
+        return f"{value:8.2f}" if value is not None else f"{'-':>8}"
+
+    lines = ["Toolchain: " + ", ".join(f"{name} {version or 'missing'}" for name, version in report["toolchain"].items())]
+    lines.append(f"{'status':<6} {'total s':>8} {'setup s':>8} {'health s':>8}  project")
+    for project in report["projects"]:
+        status = "ok" if project["ok"] else "FAIL"
+        lines.append(f"{status:<6} {seconds(project['seconds'])} {seconds(project['setup_seconds'])} "
+                     f"{seconds(project['health_seconds'])}  {project['root']}")
+        if project["error"]:
+            lines.append(f"{'':<6} {project['error']}")
+        if project["failed_files"]:
+            lines.append(f"{'':<6} failed files: {', '.join(project['failed_files'])}")
+    summary = report["summary"]
+    lines.append(f"{summary['projects']} project(s), {summary['failed']} failed, "
+                 f"{summary['wall_seconds']:.2f}s wall, {summary['total_project_seconds']:.2f}s of project time.")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    Command-line entry point.
+    :return: The process exit code, 1 if any project failed.
+    """
+    parser = argparse.ArgumentParser(description="Set up and health-check many project checkouts in parallel.")
+    parser.add_argument("projects", nargs="*", help="Project roots or glob patterns, e.g. '/srv/checkouts/*'")
+    parser.add_argument("--from-file", metavar="FILE", help="Read project roots or patterns from FILE, one per line")
+    parser.add_argument("--marker", help="Only include directories containing this file, e.g. package.json")
+    parser.add_argument("--workers", type=int, help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--no-setup", dest="setup", action="store_false", help="Skip the environment setup")
+    parser.add_argument("--no-health", dest="health", action="store_false", help="Skip the health check")
+    parser.add_argument("--no-warm-cache", dest="warm_cache", action="store_false", help="Skip the npm cache warm-up")
+    parser.add_argument("--json", metavar="FILE", help="Also write the report to FILE as JSON")
+    parser.add_argument("--log", default="fleet.log", help="Log file for the fleet run itself (default: fleet.log)")
+    args = parser.parse_args(argv)
+    route_logs(args.log)
+
+    patterns = list(args.projects)
+    if args.from_file:
+        with open(args.from_file, "r") as f:
+            patterns += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    roots = resolve_projects(patterns, args.marker)
+    if not roots:
+        parser.error("No project directories matched.")
+
+    report = run_fleet(roots, args.workers, setup=args.setup, health=args.health, warm_cache=args.warm_cache)
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=4)
+    return 1 if report["summary"]["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
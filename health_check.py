@@ -1,79 +1,183 @@
 import os
+import time
+import glob
 import json
+import hashlib
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from logger import app_logger  # Correctly import app_logger
-from error_manager import ErrorManager
+from error_manager import record_recovery_step
+from metrics import app_metrics
+from stream_validators import validate_stream, DEFAULT_CHUNK_SIZE
+from backup_store import BackupStore
+from tracing import tracer
+
+# Manifest used when the project has no configs/health_check.json
+DEFAULT_MANIFEST = {
+    "files": [
+        {
+            "pattern": "package.json",
+            "recovery_steps": ["restore_package_json", "create_package_json"],
+            "permissions": "644"  # rw-r--r--
+        },
+        {
+            "pattern": "logs/system_state.json",
+            "recovery_steps": ["restore_system_state", "initialize_system_state"],
+            "permissions": "644"  # rw-r--r--
+        },
+        {
+            "pattern": "logs/log_output.log",
+            "recovery_steps": ["create_log_file"],
+            "permissions": "644"  # rw-r--r--
+        },
+        {
+            "pattern": "configs/config.txt",
+            "recovery_steps": ["create_config_txt"],
+            "permissions": "644"  # rw-r--r--
+        },
+        {
+            "pattern": "scripts/setup.sh",
+            "recovery_steps": ["create_setup_sh"],
+            "permissions": "755"  # rwxr-xr-x
+        }
+    ]
+}
 
 class HealthCheck:
     """
     A utility to validate the integrity of key files, check permissions, and initiate recovery if necessary.
     """
-    def __init__(self, base_dir):
+    def __init__(self, base_dir, cache_file=None, manifest_file=None, max_workers=None):
         self.base_dir = base_dir
-        self.error_manager = ErrorManager()
-        self.files_to_check = {
-            "package.json": {
-                "path": os.path.join(self.base_dir, "package.json"),
-                "recovery_steps": [self.restore_package_json, self.create_package_json],
-                "permissions": "644"  # rw-r--r--
-            },
-            "system_state.json": {
-                "path": os.path.join(self.base_dir, "logs", "system_state.json"),
-                "recovery_steps": [self.restore_system_state, self.initialize_system_state],
-                "permissions": "644"  # rw-r--r--
-            },
-            "log_output.log": {
-                "path": os.path.join(self.base_dir, "logs", "log_output.log"),  # Updated path
-                "recovery_steps": [self.create_log_file],
-                "permissions": "644"  # rw-r--r--
-            },
-            "config.txt": {
-                "path": os.path.join(self.base_dir, "configs", "config.txt"),
-                "recovery_steps": [self.create_config_txt],
-                "permissions": "644"  # rw-r--r--
-            },
-            "setup.sh": {
-                "path": os.path.join(self.base_dir, "scripts", "setup.sh"),
-                "recovery_steps": [self.create_setup_sh],
-                "permissions": "755"  # rwxr-xr-x
-            }
-        }
+        # Stat fingerprints and last results from previous runs, keyed by file path
+        self.cache_file = cache_file or os.path.join(self.base_dir, "logs", "health_check_cache.json")
+        self.cache = self.load_cache()
+        self.manifest_file = manifest_file or os.path.join(self.base_dir, "configs", "health_check.json")
+        self.manifest = self.load_manifest()
+        self.max_workers = max_workers or self.manifest.get("max_workers") or min(8, os.cpu_count() or 1)
+        self.chunk_size = self.manifest.get("chunk_size", DEFAULT_CHUNK_SIZE)
+        self.checksums = self.load_checksums()
+        # Content-addressed copies of files taken whenever they validate
+        self.backup_store = BackupStore(
+            os.path.join(self.base_dir, self.manifest.get("backup_dir", "backups")),
+            keep_versions=self.manifest.get("backup_versions", 5)
+        )
+        self.files_to_check = self.resolve_manifest()
         self.recovery_summary = []  # Track recovery actions for reporting
 
-    def validate_file(self, file_path):
+    def load_manifest(self):
         """
-        Validate the integrity of a file.
-        :param file_path: Path to the file to validate.
-        :return: True if the file is valid, False otherwise.
+        Load the list of file patterns to check from the manifest file.
+        Falls back to the default manifest if the file is missing or invalid.
+        :return: The manifest as a dictionary with a "files" list.
         """
-        if not os.path.exists(file_path):
-            app_logger.log_error(f"File not found: {file_path}", context="HealthCheck")
-            return False
+        if not os.path.exists(self.manifest_file):
+            return DEFAULT_MANIFEST
         try:
-            if file_path.endswith(".json"):
-                with open(file_path, 'r') as f:
-                    json.load(f)  # Validate JSON format
-            elif file_path.endswith((".txt", ".sh", ".py")):
-                with open(file_path, 'r') as f:
-                    f.read()  # Validate readability
-            app_logger.log_info(f"File validated: {file_path}", context="HealthCheck")
-            return True
+            with open(self.manifest_file, 'r') as f:
+                manifest = json.load(f)
+            if not isinstance(manifest.get("files"), list):
+                raise ValueError("manifest must contain a 'files' list")
+            return manifest
+        except (json.JSONDecodeError, IOError, ValueError, AttributeError) as e:
+            app_logger.log_error(f"Invalid health check manifest {self.manifest_file}: {e}. Using defaults.", context="HealthCheck")
+            return DEFAULT_MANIFEST
+
+    def load_checksums(self):
+        """
+        Load the expected sha256 digests named by the manifest's "checksums_file", if any.
+        :return: A dictionary mapping paths relative to base_dir to hex digests.
+        """
+        checksums_file = self.manifest.get("checksums_file")
+        if not checksums_file:
+            return {}
+        checksums_path = os.path.join(self.base_dir, checksums_file)
+        try:
+            with open(checksums_path, 'r') as f:
+                return json.load(f)
         except (json.JSONDecodeError, IOError) as e:
-            app_logger.log_error(f"File corrupted: {file_path} - {e}", context="HealthCheck")
-            return False
+            app_logger.log_error(f"Failed to load checksums from {checksums_path}: {e}", context="HealthCheck")
+            return {}
 
-    def check_permissions(self, file_path, expected_permissions):
+    def resolve_manifest(self):
+        """
+        Expand the manifest patterns into the files to check.
+        Patterns without glob characters are always included so missing files can be recovered.
+        :return: A dictionary keyed by path relative to base_dir, in manifest order.
+        """
+        files_to_check = {}
+        for entry in self.manifest["files"]:
+            pattern = entry["pattern"]
+            if any(char in pattern for char in "*?["):
+                paths = sorted(glob.glob(os.path.join(self.base_dir, pattern), recursive=True))
+                paths = [path for path in paths if os.path.isfile(path)]
+            else:
+                paths = [os.path.join(self.base_dir, pattern)]
+            for path in paths:
+                file_name = os.path.relpath(path, self.base_dir)
+                if file_name in files_to_check:
+                    continue  # The first pattern that matches a file wins
+                validator = entry.get("validator") or self.infer_validator(path)
+                files_to_check[file_name] = {
+                    "path": path,
+                    "validator": validator,
+                    "backup": entry.get("backup", validator != "exists"),  # Log-like files are not backed up by default
+                    "recovery_steps": entry.get("recovery_steps", []),
+                    "permissions": entry.get("permissions", "644"),
+                    "max_bytes": entry.get("max_bytes", self.manifest.get("max_validate_bytes")),
+                    "sha256": self.checksums.get(file_name)
+                }
+        return files_to_check
+
+    def infer_validator(self, file_path):
+        """
+        Pick a validator from the file extension.
+        :param file_path: Path to the file.
+        :return: "json", "text" or "exists".
+        """
+        if file_path.endswith(".json"):
+            return "json"
+        if file_path.endswith((".txt", ".sh", ".py")):
+            return "text"
+        return "exists"
+
+    def validate_file(self, file_path, validator=None, max_bytes=None, expected_sha256=None, hasher=None):
+        """
+        Validate the integrity of a file. Content is streamed in chunks, so memory use does not grow with file size.
+        :param file_path: Path to the file to validate.
+        :param validator: "json", "text" or "exists". Inferred from the extension if not given.
+        :param max_bytes: Inspect at most this many bytes of content. None inspects the whole file.
+        :param expected_sha256: Optional hex digest the file must match.
+        :param hasher: Optional hashlib.sha256() object updated with the file's content while it is validated.
+        :return: True if the file is valid, False otherwise.
+        """
+        with tracer.span("HealthCheck.validate_file", path=file_path):
+            if not os.path.exists(file_path):
+                app_logger.log_error(f"File not found: {file_path}", context="HealthCheck")
+                return False
+            validator = validator or self.infer_validator(file_path)
+            try:
+                validate_stream(file_path, validator, self.chunk_size, max_bytes, expected_sha256, hasher=hasher)
+                app_logger.log_info(f"File validated: {file_path}", context="HealthCheck")
+                return True
+            except (ValueError, IOError) as e:
+                app_logger.log_error(f"File corrupted: {file_path} - {e}", context="HealthCheck")
+                return False
+
+    def check_permissions(self, file_path, expected_permissions, fix=True):
         """
         Check file permissions and fix them if necessary.
         :param file_path: Path to the file.
         :param expected_permissions: Expected permissions in octal format (e.g., "644").
+        :param fix: Fix incorrect permissions. When False the file is only checked.
         :return: True if permissions are correct, False otherwise.
         """
         try:
             current_permissions = oct(os.stat(file_path).st_mode)[-3:]
             if current_permissions != expected_permissions:
                 app_logger.log_warning(f"Incorrect permissions for {file_path}. Expected: {expected_permissions}, Found: {current_permissions}", context="HealthCheck")
-                self.fix_permissions(file_path, expected_permissions)
+                if fix:
+                    self.fix_permissions(file_path, expected_permissions)
                 return False
             app_logger.log_info(f"Permissions validated for {file_path}", context="HealthCheck")
             return True
@@ -94,26 +198,218 @@ class HealthCheck:
         except Exception as e:
             app_logger.log_error(f"Failed to fix permissions for {file_path}: {e}", context="HealthCheck")
 
-    def run_health_check(self):
+    def load_cache(self):
+        """
+        Load the fingerprint cache persisted by a previous run.
+        :return: A dictionary mapping file paths to their cached entries.
+        """
+        if not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, 'r') as f:
+                cache = json.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except (json.JSONDecodeError, IOError) as e:
+            app_logger.log_warning(f"Discarding unreadable health check cache: {e}", context="HealthCheck")
+            return {}
+
+    def save_cache(self):
+        """
+        Persist the fingerprint cache so the next run can skip unchanged files.
+        """
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            temp_path = f"{self.cache_file}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(self.cache, f)
+            os.replace(temp_path, self.cache_file)  # Atomic swap so a crash never leaves a half-written cache
+        except (IOError, OSError) as e:
+            app_logger.log_warning(f"Failed to save health check cache: {e}", context="HealthCheck")
+
+    def fingerprint(self, file_path):
+        """
+        Build a cheap fingerprint of a file from a single stat call.
+        :param file_path: Path to the file.
+        :return: [inode, size, mtime_ns, mode], or None if the file does not exist.
+        """
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+        return [st.st_ino, st.st_size, st.st_mtime_ns, st.st_mode]
+
+    def run_health_check(self, force=False, recover=True):
         """
         Run a health check on core files, check permissions, and initiate recovery if necessary.
+        Files whose fingerprint matches the cache are not re-read unless force is set.
+        Files are checked on a thread pool; recovery runs only for the files that failed.
+        :param force: Ignore the cache and fully validate every file.
+        :param recover: Run recovery steps and fix permissions. When False the files are only checked and left as they are.
+        :return: A dictionary mapping file names to their validation and permission results, in manifest order.
         """
-        for file_name, file_info in self.files_to_check.items():
-            file_path = file_info["path"]
-            valid = self.validate_file(file_path)
-            if not valid:
+        self.files_to_check = self.resolve_manifest()
+        return self.check_files(list(self.files_to_check), force=force, recover=recover)
+
+    def check_files(self, file_names, force=False, recover=True):
+        """
+        Check a subset of the resolved files, recovering those that fail.
+        :param file_names: Names (paths relative to base_dir) of entries in files_to_check.
+        :param force: Ignore the cache and fully validate every file.
+        :param recover: Run recovery steps and fix permissions. When False the files are only checked.
+        :return: A dictionary mapping file names to their validation and permission results, in the given order.
+        """
+        start = time.perf_counter()
+        self.recovery_summary = []
+        items = [(file_name, self.files_to_check[file_name]) for file_name in file_names]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            checked = list(executor.map(lambda item: self._check_file(item[1], force, recover), items))
+        results = dict(zip(file_names, checked))
+        backups = {file_name: result.pop("sha256") for file_name, result in results.items() if "sha256" in result}
+
+        failed = [(file_name, file_info) for file_name, file_info in items if not results[file_name]["valid"]]
+        if failed and not recover:
+            for file_name, _ in failed:
+                app_logger.log_error(f"File validation failed for {file_name}. Recovery skipped in check-only mode.", context="HealthCheck")
+        elif failed:
+            for file_name, _ in failed:
                 app_logger.log_error(f"File validation failed for {file_name}. Initiating recovery.", context="HealthCheck")
                 self.recovery_summary.append(f"File validation failed for {file_name}")
-                self.error_manager.recovery_loop(
-                    failing_command=lambda: None,
-                    recovery_steps=file_info["recovery_steps"]
-                )
-            # Check and fix permissions
-            if not self.check_permissions(file_path, file_info.get("permissions", "644")):
+            self.recover_files(failed)
+            # Check and fix permissions of whatever recovery left behind
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                rechecked = list(executor.map(lambda item: self._check_file(item[1], True), failed))
+            for (file_name, _), result in zip(failed, rechecked):
+                if "sha256" in result:
+                    backups[file_name] = result.pop("sha256")
+                results[file_name] = result
+
+        for file_name, result in results.items():
+            if not result["permissions_ok"]:
                 self.recovery_summary.append(f"Permissions checked for {file_name}")
+            file_info = self.files_to_check[file_name]
+            self._update_cache_entry(file_info, result["valid"], result["permissions_ok"])
+
+        self.save_cache()
+        if backups:
+            self.backup_store.record_snapshot(backups)
+        app_metrics.observe("health_check_seconds", time.perf_counter() - start, help_text="Duration of health check runs")
+        app_metrics.inc("health_check_files_total", len(results), help_text="Files checked by health checks")
+        app_metrics.inc("health_check_failures_total", len(failed), help_text="Files that failed validation")
 
         # Output recovery summary
         self.output_recovery_summary()
+        return results
+
+    def _check_file(self, file_info, force, fix_permissions=True):
+        """
+        Validate one file and check its permissions, reusing cached results if it is unchanged.
+        :param file_info: The manifest entry of the file.
+        :param force: Ignore the cache.
+        :param fix_permissions: Fix incorrect permissions.
+        :return: A dictionary with the "valid" and "permissions_ok" results, plus "sha256" if a backup was taken.
+        """
+        file_path = file_info["path"]
+        expected_permissions = file_info["permissions"]
+        fingerprint = self.fingerprint(file_path)
+        cached = self.cache.get(file_path)
+
+        if (not force and fingerprint is not None and cached
+                and cached.get("fingerprint") == fingerprint
+                and cached.get("permissions") == expected_permissions
+                and cached.get("sha256") == file_info["sha256"]):
+            # Nothing changed since the last run, so reuse its results
+            app_logger.log_info(f"File unchanged since last check: {file_path}", context="HealthCheck")
+            return {"valid": cached["valid"], "permissions_ok": cached["permissions_ok"]}
+
+        # A backup needs the whole file hashed, so files larger than the inspection cap are not backed up
+        max_bytes = file_info["max_bytes"]
+        truncated = max_bytes is not None and fingerprint is not None and fingerprint[1] > max_bytes and not file_info["sha256"]
+        hasher = hashlib.sha256() if file_info["backup"] and not truncated else None
+        valid = self._validate_entry(file_info, hasher)
+        permissions_ok = self.check_permissions(file_path, expected_permissions, fix_permissions) if valid else False
+        result = {"valid": valid, "permissions_ok": permissions_ok}
+        if valid and hasher is not None:
+            try:
+                # The digest comes from the validation pass, so known content costs no extra read
+                digest = self.backup_store.store_blob(file_path, hasher.hexdigest())
+            except (IOError, OSError) as e:
+                app_logger.log_warning(f"Failed to back up {file_path}: {e}", context="HealthCheck")
+                digest = None
+            if digest:
+                result["sha256"] = digest
+        return result
+
+    def _validate_entry(self, file_info, hasher=None, file_path=None):
+        """
+        Validate a file with the settings from its manifest entry.
+        :param file_info: The manifest entry of the file.
+        :param hasher: Optional hashlib.sha256() object updated with the file's content.
+        :param file_path: Validate this path (e.g. a backup blob) instead of the entry's own path.
+        :return: True if the file is valid, False otherwise.
+        """
+        return self.validate_file(file_path or file_info["path"], file_info["validator"], file_info["max_bytes"], file_info["sha256"], hasher)
+
+    def recover_files(self, failed):
+        """
+        Run recovery steps for the failed files, batched per step.
+        Each step runs once with every failed file that lists it; files that validate
+        after a step are not passed to later steps.
+        :param failed: A list of (file_name, file_info) tuples for the files that failed validation.
+        """
+        pending = dict(failed)
+        step_names = []
+        for _, file_info in failed:
+            for step_name in file_info["recovery_steps"]:
+                if step_name not in step_names:
+                    step_names.append(step_name)
+
+        for step_name in step_names:
+            batch = [file_name for file_name, file_info in pending.items() if step_name in file_info["recovery_steps"]]
+            if not batch:
+                continue
+            step = getattr(self, step_name, None)
+            if not callable(step):
+                app_logger.log_error(f"Unknown recovery step: {step_name}", context="HealthCheck")
+                continue
+            start = time.perf_counter()
+            try:
+                with tracer.span(f"HealthCheck.recovery_step:{step_name}", files=len(batch)):
+                    app_logger.log_info(f"Executing recovery step: {step_name} for {len(batch)} file(s)", context="HealthCheck")
+                    step([pending[file_name]["path"] for file_name in batch])
+            except Exception as e:
+                app_logger.log_error(f"Recovery step {step_name} failed: {e}", context="HealthCheck")
+                record_recovery_step(step_name, "failure", time.perf_counter() - start)
+                continue
+            record_recovery_step(step_name, "success", time.perf_counter() - start)
+            for file_name in batch:
+                if self._validate_entry(pending[file_name]):
+                    del pending[file_name]
+
+        for file_name in pending:
+            app_logger.log_error(f"Recovery failed for {file_name}.", context="HealthCheck")
+        app_metrics.inc("health_check_recoveries_total", len(failed) - len(pending), help_text="Files recovered by health checks", outcome="success")
+        app_metrics.inc("health_check_recoveries_total", len(pending), help_text="Files recovered by health checks", outcome="failure")
+
+    def _update_cache_entry(self, file_info, valid, permissions_ok):
+        """
+        Record the fingerprint of a file together with the results of checking it.
+        Entries are dropped when recovery or a permission fix may have changed the file.
+        :param file_info: The manifest entry of the file.
+        :param valid: Result of the content validation.
+        :param permissions_ok: Result of the permission check.
+        """
+        file_path = file_info["path"]
+        fingerprint = self.fingerprint(file_path)
+        if fingerprint is None or not valid or not permissions_ok:
+            self.cache.pop(file_path, None)
+            return
+        self.cache[file_path] = {
+            "fingerprint": fingerprint,
+            "permissions": file_info["permissions"],
+            "sha256": file_info["sha256"],
+            "valid": valid,
+            "permissions_ok": permissions_ok
+        }
 
     def output_recovery_summary(self):
         """
@@ -126,81 +422,108 @@ class HealthCheck:
         else:
             app_logger.log_info("No recovery actions were necessary. All files are healthy.", context="HealthCheck")
 
-    def restore_package_json(self):
+    def restore_from_backup(self, file_paths):
+        """
+        Restore each file from the newest valid version in the backup store,
+        or from its "<path>.backup" copy if the store has none.
+        :param file_paths: Paths of the files to restore.
+        """
+        for file_path in file_paths:
+            file_name = os.path.basename(file_path)
+            file_info = self.files_to_check.get(os.path.relpath(file_path, self.base_dir))
+            if file_info:
+                digest = self.backup_store.restore(
+                    os.path.relpath(file_path, self.base_dir), file_path,
+                    validate=lambda blob_path: self._validate_entry(file_info, file_path=blob_path)
+                )
+                if digest:
+                    app_logger.log_info(f"Restored {file_name} from backup store ({digest[:12]}).", context="HealthCheck")
+                    self.recovery_summary.append(f"Restored {file_name} from backup store")
+                    continue
+            backup_path = f"{file_path}.backup"
+            if os.path.exists(backup_path):
+                os.replace(backup_path, file_path)
+                app_logger.log_info(f"Restored {file_name} from backup.", context="HealthCheck")
+                self.recovery_summary.append(f"Restored {file_name} from backup")
+            else:
+                app_logger.log_warning(f"No backup found for {file_name}.", context="HealthCheck")
+
+    def restore_package_json(self, file_paths=None):
         """
         Restore package.json from a backup if available.
+        :param file_paths: Paths of the package.json files to restore. Defaults to the project's package.json.
         """
-        backup_path = os.path.join(self.base_dir, "package.json.backup")
-        if os.path.exists(backup_path):
-            os.replace(backup_path, self.files_to_check["package.json"]["path"])
-            app_logger.log_info("Restored package.json from backup.", context="HealthCheck")
-            self.recovery_summary.append("Restored package.json from backup")
-        else:
-            app_logger.log_warning("No backup found for package.json.", context="HealthCheck")
+        self.restore_from_backup(file_paths or [os.path.join(self.base_dir, "package.json")])
 
-    def create_package_json(self):
+    def create_package_json(self, file_paths=None):
         """
         Create a new package.json with a minimal valid structure.
+        :param file_paths: Paths of the package.json files to create. Defaults to the project's package.json.
         """
-        with open(self.files_to_check["package.json"]["path"], 'w') as f:
-            json.dump({"name": "project", "version": "1.0.0"}, f, indent=4)
-        app_logger.log_info("Created new package.json.", context="HealthCheck")
-        self.recovery_summary.append("Created new package.json")
+        for file_path in file_paths or [os.path.join(self.base_dir, "package.json")]:
+            with open(file_path, 'w') as f:
+                json.dump({"name": "project", "version": "1.0.0"}, f, indent=4)
+            app_logger.log_info("Created new package.json.", context="HealthCheck")
+            self.recovery_summary.append("Created new package.json")
 
-    def restore_system_state(self):
+    def restore_system_state(self, file_paths=None):
         """
         Restore system_state.json from a backup if available.
+        :param file_paths: Paths of the state files to restore. Defaults to logs/system_state.json.
         """
-        backup_path = os.path.join(self.base_dir, "logs", "system_state.json.backup")
-        if os.path.exists(backup_path):
-            os.replace(backup_path, self.files_to_check["system_state.json"]["path"])
-            app_logger.log_info("Restored system_state.json from backup.", context="HealthCheck")
-            self.recovery_summary.append("Restored system_state.json from backup")
-        else:
-            app_logger.log_warning("No backup found for system_state.json.", context="HealthCheck")
+        self.restore_from_backup(file_paths or [os.path.join(self.base_dir, "logs", "system_state.json")])
 
-    def initialize_system_state(self):
+    def initialize_system_state(self, file_paths=None):
         """
         Initialize system_state.json with an empty state.
+        :param file_paths: Paths of the state files to initialize. Defaults to logs/system_state.json.
         """
-        with open(self.files_to_check["system_state.json"]["path"], 'w') as f:
-            json.dump({}, f, indent=4)
-        app_logger.log_info("Initialized system_state.json with empty state.", context="HealthCheck")
-        self.recovery_summary.append("Initialized system_state.json with empty state")
+        for file_path in file_paths or [os.path.join(self.base_dir, "logs", "system_state.json")]:
+            with open(file_path, 'w') as f:
+                json.dump({}, f, indent=4)
+            app_logger.log_info(f"Initialized {os.path.basename(file_path)} with empty state.", context="HealthCheck")
+            self.recovery_summary.append(f"Initialized {os.path.basename(file_path)} with empty state")
 
-    def create_log_file(self):
+    def create_log_file(self, file_paths=None):
         """
         Create a new log_output.log file if it doesn't exist.
+        :param file_paths: Paths of the log files to create. Defaults to logs/log_output.log.
         """
-        if not os.path.exists(self.files_to_check["log_output.log"]["path"]):
-            with open(self.files_to_check["log_output.log"]["path"], 'w') as f:
-                f.write("")
-            app_logger.log_info("Created new log_output.log.", context="HealthCheck")
-            self.recovery_summary.append("Created new log_output.log")
+        for file_path in file_paths or [os.path.join(self.base_dir, "logs", "log_output.log")]:
+            if not os.path.exists(file_path):
+                with open(file_path, 'w') as f:
+                    f.write("")
+                app_logger.log_info(f"Created new {os.path.basename(file_path)}.", context="HealthCheck")
+                self.recovery_summary.append(f"Created new {os.path.basename(file_path)}")
 
-    def create_config_txt(self):
+    def create_config_txt(self, file_paths=None):
         """
         Create a new config.txt file with default content.
+        :param file_paths: Paths of the config files to create. Defaults to configs/config.txt.
         """
-        if not os.path.exists(self.files_to_check["config.txt"]["path"]):
-            with open(self.files_to_check["config.txt"]["path"], 'w') as f:
-                f.write("Default configuration")
-            app_logger.log_info("Created new config.txt.", context="HealthCheck")
-            self.recovery_summary.append("Created new config.txt")
+        for file_path in file_paths or [os.path.join(self.base_dir, "configs", "config.txt")]:
+            if not os.path.exists(file_path):
+                with open(file_path, 'w') as f:
+                    f.write("Default configuration")
+                app_logger.log_info(f"Created new {os.path.basename(file_path)}.", context="HealthCheck")
+                self.recovery_summary.append(f"Created new {os.path.basename(file_path)}")
 
-    def create_setup_sh(self):
+    def create_setup_sh(self, file_paths=None):
         """
         Create a new setup.sh script with default content.
+        :param file_paths: Paths of the scripts to create. Defaults to scripts/setup.sh.
         """
-        if not os.path.exists(self.files_to_check["setup.sh"]["path"]):
-            with open(self.files_to_check["setup.sh"]["path"], 'w') as f:
-                f.write("#!/bin/bash\n# Default setup script")
-            os.chmod(self.files_to_check["setup.sh"]["path"], 0o755)  # Set executable permissions
-            app_logger.log_info("Created new setup.sh.", context="HealthCheck")
-            self.recovery_summary.append("Created new setup.sh")
+        for file_path in file_paths or [os.path.join(self.base_dir, "scripts", "setup.sh")]:
+            if not os.path.exists(file_path):
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                with open(file_path, 'w') as f:
+                    f.write("#!/bin/bash\n# Default setup script")
+                os.chmod(file_path, 0o755)  # Set executable permissions
+                app_logger.log_info(f"Created new {os.path.basename(file_path)}.", context="HealthCheck")
+                self.recovery_summary.append(f"Created new {os.path.basename(file_path)}")
 
 # Example usage
 if __name__ == "__main__":
     base_dir = "/Users/crashair/AI-Software/_Interpreter/Projects/Project-001"
     health_check = HealthCheck(base_dir)
-    health_check.run_health_check()
\ No newline at end of file
+    health_check.run_health_check()
@@ -0,0 +1,123 @@
+import os
+import json
+import time
+import argparse
+import threading
+from flask import Flask, Response
+from logger import app_logger
+from metrics import app_metrics
+from health_check import HealthCheck
+from state_manager import StateManager
+
+
+class HealthMonitor:
+    """
+    Recomputes health and readiness on a schedule so probes only read cached results.
+    """
+
+    def __init__(self, health_check, state_manager, interval=30):
+        """
+        Initialize the HealthMonitor.
+        :param health_check: The HealthCheck to run on each refresh.
+        :param state_manager: The StateManager whose "initialized" value decides readiness.
+        :param interval: Seconds between refreshes.
+        """
+        self.health_check = health_check
+        self.state_manager = state_manager
+        self.interval = interval
+        # Pre-rendered (status code, JSON body) pairs, swapped atomically on refresh
+        self.health = (503, json.dumps({"status": "starting"}))
+        self.ready = (503, json.dumps({"ready": False}))
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def refresh(self):
+        """
+        Run the health check, reload the state and update the cached responses.
+        The check only reports: recovery rewrites files, which a monitor must not do on a timer.
+        """
+        start = time.perf_counter()
+        try:
+            results = self.health_check.run_health_check(recover=False)
+            healthy = all(result["valid"] for result in results.values())
+            body = {
+                "status": "ok" if healthy else "failing",
+                "checked_at": time.time(),
+                "files": results
+            }
+            self.health = (200 if healthy else 503, json.dumps(body))
+        except Exception as e:
+            app_logger.log_error(f"Health refresh failed: {e}", context="HealthMonitor")
+            self.health = (503, json.dumps({"status": "error", "checked_at": time.time(), "error": str(e)}))
+        app_metrics.observe("health_refresh_seconds", time.perf_counter() - start, help_text="Duration of background health refreshes")
+
+        try:
+            self.state_manager.load_state()
+            initialized = bool(self.state_manager.get_value("initialized"))
+            self.ready = (200 if initialized else 503, json.dumps({"ready": initialized}))
+        except Exception as e:
+            app_logger.log_error(f"Readiness refresh failed: {e}", context="HealthMonitor")
+            self.ready = (503, json.dumps({"ready": False, "error": str(e)}))
+
+    def start(self):
+        """
+        Refresh once, then keep refreshing in a background thread.
+        """
+        self.refresh()
+        self._thread = threading.Thread(target=self._run, name="HealthMonitor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        """
+        Stop the background refresher.
+        :param timeout: Seconds to wait for the thread.
+        """
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.refresh()
+
+
+def create_app(monitor):
+    """
+    Create the Flask app serving the monitor's cached results.
+    :param monitor: The HealthMonitor to serve.
+    :return: The Flask app.
+    """
+    app = Flask(__name__)
+
+    @app.route("/healthz")
+    def healthz():
+        status, body = monitor.health
+        return Response(body, status=status, mimetype="application/json")
+
+    @app.route("/readyz")
+    def readyz():
+        status, body = monitor.ready
+        return Response(body, status=status, mimetype="application/json")
+
+    @app.route("/metrics")
+    def metrics():
+        return Response(app_metrics.render_prometheus(), mimetype="text/plain; version=0.0.4")
+
+    return app
+
+# Example usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve cached health check results over HTTP.")
+    parser.add_argument("base_dir", nargs="?", default=os.path.dirname(os.path.abspath(__file__)))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--interval", type=float, default=30, help="Seconds between health check refreshes")
+    args = parser.parse_args()
+
+    monitor = HealthMonitor(
+        HealthCheck(args.base_dir),
+        StateManager(os.path.join(args.base_dir, "logs", "system_state.json")),
+        interval=args.interval
+    )
+    monitor.start()
+    create_app(monitor).run(host=args.host, port=args.port, threaded=True)
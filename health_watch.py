@@ -0,0 +1,349 @@
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import threading
+from logger import app_logger
+from health_check import HealthCheck
+
+# inotify event masks (see <sys/inotify.h>)
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+WATCH_MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR
+# Events that matter for files validated by existence only (e.g. log files that are appended to constantly)
+PRESENCE_MASK = IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class Inotify:
+    """
+    A minimal ctypes wrapper around the Linux inotify API.
+    """
+
+    def __init__(self):
+        """
+        Create a non-blocking inotify instance.
+        Raises OSError if inotify is not available on this platform.
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+    def add_watch(self, path, mask):
+        """
+        Watch a directory for the given events.
+        :param path: Directory to watch.
+        :param mask: inotify event mask.
+        :return: The watch descriptor.
+        """
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), ctypes.c_uint32(mask))
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def read_events(self):
+        """
+        Read all pending events without blocking.
+        :return: A list of (wd, mask, name) tuples.
+        """
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                events.append((wd, mask, name))
+
+    def close(self):
+        """
+        Close the inotify file descriptor.
+        """
+        os.close(self.fd)
+
+
+class HealthWatcher:
+    """
+    Watches the files of a HealthCheck manifest and revalidates each file as soon as it changes.
+    Uses inotify where available and falls back to polling file fingerprints.
+    """
+
+    def __init__(self, health_check, debounce=0.5, poll_interval=2.0, use_inotify=True, max_wait=5.0):
+        """
+        Initialize the watcher.
+        :param health_check: The HealthCheck whose files are watched.
+        :param debounce: Seconds without further events before changed files are revalidated.
+        :param max_wait: Seconds after the first change by which pending files are revalidated,
+            even if they keep changing (e.g. a log file that is written continuously).
+        :param poll_interval: Seconds between scans when falling back to polling.
+        :param use_inotify: Set to False to always poll.
+        """
+        self.health_check = health_check
+        self.debounce = debounce
+        self.max_wait = max_wait
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.checks_run = 0  # Number of revalidation batches, for monitoring
+        self.ready = threading.Event()  # Set once changes are being watched
+        self._stop_event = threading.Event()
+        self._wake_read, self._wake_write = os.pipe()
+        self._pipe_open = True
+        self._pipe_lock = threading.Lock()  # Guards the pipe so it is never written after it is closed
+        self._thread = None
+        self._path_index = {}  # Absolute path -> file name in health_check.files_to_check
+        self._watches = {}  # Watch descriptor -> watched directory
+        self._watched_dirs = set()
+
+    def start(self):
+        """
+        Run the watcher in a background thread.
+        """
+        self._thread = threading.Thread(target=self.run, name="HealthWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        """
+        Stop the watcher and wait for the background thread to exit.
+        Also releases the wake-up pipe of a watcher that was never started.
+        :param timeout: Seconds to wait for the thread.
+        """
+        self._stop_event.set()
+        with self._pipe_lock:
+            if self._pipe_open:
+                os.write(self._wake_write, b"x")
+        if self._thread:
+            self._thread.join(timeout)
+        if self._thread is None or not self._thread.is_alive():
+            self._close_pipe()
+
+    def _close_pipe(self):
+        with self._pipe_lock:
+            if self._pipe_open:
+                self._pipe_open = False
+                os.close(self._wake_read)
+                os.close(self._wake_write)
+
+    def run(self):
+        """
+        Run the full health check once, then watch for changes until stopped.
+        """
+        app_logger.log_info("Starting health watch.", context="HealthWatcher")
+        self.health_check.run_health_check()
+        inotify = None
+        if self.use_inotify:
+            try:
+                inotify = Inotify()
+            except (OSError, AttributeError) as e:
+                app_logger.log_warning(f"inotify unavailable ({e}). Falling back to polling.", context="HealthWatcher")
+        try:
+            if inotify:
+                self._run_inotify(inotify)
+            else:
+                self._run_polling()
+        finally:
+            if inotify:
+                inotify.close()
+            self._close_pipe()
+            app_logger.log_info("Health watch stopped.", context="HealthWatcher")
+
+    def _rebuild_index(self):
+        """
+        Re-resolve the manifest and index the watched files by absolute path.
+        :return: Names of files that were not watched before.
+        """
+        previous = set(self._path_index.values())
+        self.health_check.files_to_check = self.health_check.resolve_manifest()
+        self._path_index = {file_info["path"]: file_name for file_name, file_info in self.health_check.files_to_check.items()}
+        return [file_name for file_name in self.health_check.files_to_check if file_name not in previous]
+
+    def _directories_to_watch(self):
+        """
+        Collect the directories that hold watched files, plus the fixed prefix of each glob pattern.
+        Missing directories are replaced by their nearest existing ancestor so their creation is noticed.
+        :return: A set of directory paths.
+        """
+        candidates = {os.path.dirname(file_info["path"]) for file_info in self.health_check.files_to_check.values()}
+        for entry in self.health_check.manifest["files"]:
+            parts = entry["pattern"].split("/")
+            fixed = []
+            for part in parts[:-1]:
+                if any(char in part for char in "*?["):
+                    break
+                fixed.append(part)
+            root = os.path.join(self.health_check.base_dir, *fixed)
+            candidates.add(root)
+            if "**" in entry["pattern"] and os.path.isdir(root):
+                for dirpath, _, _ in os.walk(root):
+                    candidates.add(dirpath)
+        directories = set()
+        for directory in candidates:
+            while not os.path.isdir(directory) and os.path.dirname(directory) != directory:
+                directory = os.path.dirname(directory)
+            directories.add(directory)
+        return directories
+
+    def _update_watches(self, inotify):
+        """
+        Add inotify watches for any directory that is not watched yet.
+        :param inotify: The Inotify instance.
+        """
+        for directory in self._directories_to_watch() - self._watched_dirs:
+            try:
+                wd = inotify.add_watch(directory, WATCH_MASK)
+            except OSError as e:
+                app_logger.log_warning(f"Cannot watch {directory}: {e}", context="HealthWatcher")
+                continue
+            self._watches[wd] = directory
+            self._watched_dirs.add(directory)
+
+    def _is_relevant(self, file_name, mask):
+        """
+        Decide whether an event should trigger revalidation of a file.
+        Content writes are ignored for files that are only checked for existence.
+        :param file_name: Name of the file in files_to_check.
+        :param mask: inotify event mask.
+        :return: True if the file should be revalidated.
+        """
+        if self.health_check.files_to_check[file_name]["validator"] == "exists":
+            return bool(mask & PRESENCE_MASK)
+        return True
+
+    def _run_inotify(self, inotify):
+        """
+        Event loop driven by inotify. Blocks in select() while nothing changes.
+        :param inotify: The Inotify instance.
+        """
+        self._rebuild_index()
+        self._update_watches(inotify)
+        self.ready.set()
+        pending = set()
+        rescan = False
+        deadline = None
+        first_change = None  # When the pending batch started, for the max_wait cap
+        while not self._stop_event.is_set():
+            timeout = None if deadline is None else max(0, deadline - time.monotonic())
+            readable, _, _ = select.select([inotify.fd, self._wake_read], [], [], timeout)
+            if self._wake_read in readable:
+                os.read(self._wake_read, 1024)
+            if inotify.fd in readable:
+                for wd, mask, name in inotify.read_events():
+                    if mask & IN_Q_OVERFLOW:
+                        # Events were dropped, so everything may have changed
+                        rescan = True
+                        pending.update(self.health_check.files_to_check)
+                        continue
+                    if mask & IN_IGNORED:
+                        self._watched_dirs.discard(self._watches.pop(wd, None))
+                        rescan = True
+                        continue
+                    directory = self._watches.get(wd)
+                    if directory is None or not name:
+                        continue
+                    file_name = self._path_index.get(os.path.join(directory, name))
+                    if file_name is None:
+                        if mask & (IN_CREATE | IN_MOVED_TO):
+                            rescan = True  # A new file or directory may match a glob
+                        else:
+                            continue
+                    elif not self._is_relevant(file_name, mask):
+                        continue
+                    else:
+                        pending.add(file_name)
+                    now = time.monotonic()
+                    if first_change is None:
+                        first_change = now
+                    deadline = min(now + self.debounce, first_change + self.max_wait)
+            if deadline is not None and time.monotonic() >= deadline:
+                if rescan:
+                    pending.update(self._rebuild_index())
+                    self._update_watches(inotify)
+                    rescan = False
+                self._revalidate(pending)
+                pending = set()
+                deadline = None
+                first_change = None
+
+    def _snapshot(self):
+        """
+        Fingerprint every watched file for the polling fallback.
+        :return: A dictionary mapping file names to their fingerprints.
+        """
+        snapshot = {}
+        for file_name, file_info in self.health_check.files_to_check.items():
+            fingerprint = self.health_check.fingerprint(file_info["path"])
+            if fingerprint is not None and file_info["validator"] == "exists":
+                fingerprint = [fingerprint[0], fingerprint[3]]  # Only inode and mode matter
+            snapshot[file_name] = fingerprint
+        return snapshot
+
+    def _run_polling(self):
+        """
+        Polling loop used when inotify is unavailable.
+        Changes are revalidated once a full interval passes without further changes, or max_wait after the first one.
+        """
+        self._rebuild_index()
+        previous = self._snapshot()
+        self.ready.set()
+        pending = set()
+        first_change = None
+        while not self._stop_event.wait(self.poll_interval):
+            self._rebuild_index()
+            current = self._snapshot()
+            changed = {file_name for file_name in current if current[file_name] != previous.get(file_name)}
+            previous = current
+            if changed:
+                if not pending:
+                    first_change = time.monotonic()
+                pending.update(changed)
+            if pending and (not changed or time.monotonic() - first_change >= self.max_wait):
+                self._revalidate(pending)
+                pending = set()
+                previous = self._snapshot()  # Ignore changes made by recovery itself
+
+    def _revalidate(self, file_names):
+        """
+        Revalidate the changed files and run recovery for those that fail.
+        :param file_names: Names of the changed files.
+        """
+        file_names = [file_name for file_name in self.health_check.files_to_check if file_name in file_names]
+        if not file_names:
+            return
+        app_logger.log_info(f"Revalidating {len(file_names)} changed file(s).", context="HealthWatcher")
+        try:
+            self.health_check.check_files(file_names)
+        except Exception as e:
+            app_logger.log_error(f"Health check of changed files failed: {e}", context="HealthWatcher")
+        self.checks_run += 1
+
+# Example usage
+if __name__ == "__main__":
+    base_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.path.abspath(__file__))
+    watcher = HealthWatcher(HealthCheck(base_dir))
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        app_logger.log_info("Health watch interrupted by user.", context="HealthWatcher")
@@ -0,0 +1,272 @@
+import os
+import time
+import shlex
+import itertools
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from loguru import logger
+from process_runner import cancel_event
+
+CANCEL_TIMEOUT = 10  # Seconds cancel() waits for a running job to stop
+
+
+class Job:
+    """
+    A command submitted to run in the background.
+    """
+
+    def __init__(self, job_id, command, locks, log_path):
+        self.id = job_id
+        self.command = command
+        self.locks = locks
+        self.log_path = log_path
+        self.status = "queued"  # queued, waiting, running, done, failed, cancelled
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.future = None
+        self.cancel_event = threading.Event()
+
+    def describe(self):
+        """
+        Summarize the job on one line.
+        """
+        if self.finished and self.started:
+            timing = f" in {self.finished - self.started:.2f}s"
+        elif self.started:
+            timing = f" for {time.time() - self.started:.2f}s"
+        else:
+            timing = ""
+        return f"[{self.id}] {self.status}{timing}: {self.command}"
+
+
+class JobManager:
+    """
+    Runs long commands on a thread pool so the REPL prompt returns immediately.
+    Commands that share a lock name (e.g. "npm") never run at the same time, whether they run
+    as background jobs or in the foreground through locked().
+    """
+
+    def __init__(self, runner, log_dir, max_workers=4, locks_for=None):
+        """
+        Initialize the JobManager.
+        :param runner: Callable that executes a command line and returns its output.
+        :param log_dir: Directory that receives one log file per job.
+        :param max_workers: Maximum number of jobs running at once.
+        :param locks_for: Optional callable returning the lock names a command needs.
+        """
+        self.runner = runner
+        self.log_dir = log_dir
+        self.locks_for = locks_for or (lambda command: [])
+        self.jobs = {}
+        self._ids = itertools.count(1)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self._status_lock = threading.Lock()  # Orders status changes of the workers against cancel()
+
+    def _lock(self, name):
+        with self._locks_guard:
+            # Reentrant, so a job's thread can run its command through locked() while holding the job's locks
+            return self._locks.setdefault(name, threading.RLock())
+
+    def submit(self, command):
+        """
+        Submit a command to run in the background.
+        :param command: The command line.
+        :return: The new Job.
+        """
+        job_id = next(self._ids)
+        os.makedirs(self.log_dir, exist_ok=True)
+        job = Job(job_id, command, sorted(set(self.locks_for(command))), os.path.join(self.log_dir, f"job-{job_id}.log"))
+        self.jobs[job_id] = job
+        job.future = self._executor.submit(self._run, job)
+        logger.info(f"Submitted job {job_id}: {command}")
+        return job
+
+    @contextmanager
+    def locked(self, command):
+        """
+        Hold the locks a command needs while it runs in the foreground,
+        waiting for any background job that holds them to finish.
+        :param command: The command line.
+        """
+        acquired = []
+        try:
+            for name in sorted(set(self.locks_for(command))):
+                lock = self._lock(name)
+                if not lock.acquire(blocking=False):
+                    logger.info(f"Waiting for the background job holding '{name}' before running: {command}")
+                    lock.acquire()
+                acquired.append(lock)
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
+
+    def _acquire_locks(self, job):
+        """
+        Take the job's locks in a fixed order, giving up if the job is cancelled meanwhile.
+        :return: The acquired locks, or None if the job was cancelled.
+        """
+        acquired = []
+        for name in job.locks:
+            lock = self._lock(name)
+            while not lock.acquire(timeout=0.1):
+                if job.cancel_event.is_set():
+                    for held in reversed(acquired):
+                        held.release()
+                    return None
+            acquired.append(lock)
+        return acquired
+
+    def _set_status(self, job, status):
+        """
+        Move a job to a new status unless it was cancelled first.
+        :return: False if the job was cancelled.
+        """
+        with self._status_lock:
+            if job.cancel_event.is_set():
+                job.status = "cancelled"
+                job.finished = time.time()
+                return False
+            job.status = status
+            return True
+
+    def _run(self, job):
+        if not self._set_status(job, "waiting" if job.locks else "running"):
+            return
+        acquired = self._acquire_locks(job)
+        if acquired is None:
+            self._set_status(job, "cancelled")
+            return
+        # Route log records emitted in the job's context, including by threads that copy it, into the job's own log
+        sink_id = logger.add(job.log_path, level="DEBUG", filter=lambda record: record["extra"].get("job_id") == job.id)
+        try:
+            if not self._set_status(job, "running"):
+                return
+            job.started = time.time()
+            # Commands run through the process runner are killed once the job's cancel event is set
+            cancel_token = cancel_event.set(job.cancel_event)
+            with logger.contextualize(job_id=job.id):
+                try:
+                    logger.info(f"Job {job.id} started: {job.command}")
+                    job.result = self.runner(job.command)
+                    job.status = "done"
+                    if job.result is not None:
+                        logger.info(f"Job {job.id} output:\n{job.result}")
+                except Exception as e:
+                    job.error = str(e)
+                    job.status = "cancelled" if job.cancel_event.is_set() else "failed"
+                    logger.error(f"Job {job.id} {job.status}: {e}")
+                finally:
+                    cancel_event.reset(cancel_token)
+                    job.finished = time.time()
+        finally:
+            logger.remove(sink_id)
+            for lock in reversed(acquired):
+                lock.release()
+
+    def get(self, job_id):
+        """
+        Look up a job by id.
+        :param job_id: The job id, as an int or string.
+        :return: The Job.
+        Raises ValueError if there is no such job.
+        """
+        try:
+            return self.jobs[int(job_id)]
+        except (KeyError, ValueError):
+            raise ValueError(f"No job with id {job_id}.")
+
+    def wait(self, job_id, timeout=None):
+        """
+        Block until a job finishes.
+        :param job_id: The job id.
+        :param timeout: Optional seconds to wait.
+        :return: The Job.
+        """
+        job = self.get(job_id)
+        try:
+            job.future.result(timeout=None if timeout is None else float(timeout))
+        except Exception:
+            pass  # Timeouts and cancellations are reported through the job status
+        return job
+
+    def cancel(self, job_id, timeout=CANCEL_TIMEOUT):
+        """
+        Cancel a job. A queued or waiting job never starts; a running job has the command it is
+        running through the process runner killed, and stops when that command fails.
+        :param job_id: The job id.
+        :param timeout: Seconds to wait for a running job to stop.
+        :return: True if the job was cancelled, False if it had already finished or ran to completion.
+        """
+        job = self.get(job_id)
+        with self._status_lock:
+            if job.status in ("done", "failed", "cancelled"):
+                return False
+            job.cancel_event.set()
+            if job.future.cancel():
+                job.status = "cancelled"
+                job.finished = time.time()
+                return True
+        try:
+            job.future.result(timeout=timeout)  # The worker notices the cancel event
+        except Exception:
+            pass  # Still running; the status below says so
+        return job.status == "cancelled"
+
+    def output(self, job_id):
+        """
+        Read the log of a job.
+        :param job_id: The job id.
+        :return: The log contents so far.
+        """
+        job = self.get(job_id)
+        if not os.path.exists(job.log_path):
+            return ""
+        with open(job.log_path, "r") as f:
+            return f.read()
+
+    def shutdown(self):
+        """
+        Cancel queued jobs and wait for running ones to finish.
+        """
+        for job in self.jobs.values():
+            if job.status in ("queued", "waiting"):
+                job.cancel_event.set()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        for job in self.jobs.values():
+            if job.status == "queued":
+                job.status = "cancelled"
+
+    def register_commands(self, registry):
+        """
+        Add the job control commands to a CommandRegistry.
+        :param registry: The CommandRegistry.
+        """
+        registry.register("bg", handler=lambda profile, *words: self._submit_command(words), aliases=["&"],
+                          help_text="Run a command in the background, e.g. 'bg setup'. A trailing '&' does the same")
+        registry.register("jobs", handler=lambda profile: self._list_jobs(), help_text="List background jobs")
+        registry.register("wait", handler=lambda profile, job_id, timeout=None: self.wait(job_id, timeout).describe(),
+                          help_text="Wait for a background job to finish")
+        registry.register("cancel", handler=lambda profile, job_id: self._cancel_command(job_id), help_text="Cancel a background job, killing the command it is running")
+        registry.register("output", handler=lambda profile, job_id: self.output(job_id), help_text="Show the log of a background job")
+
+    def _submit_command(self, words):
+        if not words:
+            raise ValueError("Usage: bg <command>")
+        return f"Started job {self.submit(shlex.join(words)).id}"
+
+    def _list_jobs(self):
+        if not self.jobs:
+            return "No jobs."
+        return "\n".join(job.describe() for job in self.jobs.values())
+
+    def _cancel_command(self, job_id):
+        if self.cancel(job_id):
+            return f"Cancelled job {job_id}"
+        return f"Job {job_id} is {self.get(job_id).status} and cannot be cancelled."
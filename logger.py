@@ -1,12 +1,38 @@
+import threading
 from loguru import logger
+from metrics import app_metrics
+from startup_profile import startup_profiler
 
 class Logger:
-    def __init__(self, log_file="logs/log_output.log"):  # Updated path
+    _sinks = {}  # Log file -> loguru sink id, shared by every Logger writing to that file
+    _sinks_lock = threading.Lock()
+
+    def __init__(self, log_file="logs/log_output.log", enqueue=False):  # Updated path
+        """
+        :param log_file: Path of the log file.
+        :param enqueue: Hand records to a background thread instead of writing them in the caller.
+        """
         self.log_file = log_file
-        self._setup_logging()
+        self.enqueue = enqueue
 
     def _setup_logging(self):
-        logger.add(self.log_file, rotation="1 MB", retention="10 days", level="DEBUG")
+        """
+        Add the file sink on first use, once per log file.
+        """
+        if self.log_file in Logger._sinks:
+            return
+        with Logger._sinks_lock:
+            if self.log_file not in Logger._sinks:
+                with startup_profiler.phase("sink setup"):
+                    sink_id = logger.add(self.log_file, rotation="1 MB", retention="10 days", level="DEBUG", enqueue=self.enqueue)
+                    Logger._sinks[self.log_file] = sink_id
+
+    def _record_volume(self, level, message):
+        """
+        Count logged messages and bytes for the metrics endpoint.
+        """
+        app_metrics.inc("log_messages_total", help_text="Log messages written", level=level)
+        app_metrics.inc("log_bytes_total", len(message), help_text="Bytes of log messages written", level=level)
 
     def log_info(self, message, context=None):
         """
@@ -14,6 +40,8 @@ class Logger:
         :param message: The message to log.
         :param context: Optional context to include in the log message.
         """
+        self._setup_logging()
+        self._record_volume("info", message)
         if context:
             logger.info(f"[{context}] {message}")
         else:
@@ -25,6 +53,8 @@ class Logger:
         :param message: The message to log.
         :param context: Optional context to include in the log message.
         """
+        self._setup_logging()
+        self._record_volume("error", message)
         if context:
             logger.error(f"[{context}] {message}")
         else:
@@ -36,6 +66,8 @@ class Logger:
         :param message: The message to log.
         :param context: Optional context to include in the log message.
         """
+        self._setup_logging()
+        self._record_volume("warning", message)
         if context:
             logger.warning(f"[{context}] {message}")
         else:
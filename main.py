@@ -1,23 +1,100 @@
 import sys
 import os
+import argparse
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from custom_profile import CustomProfile  # Ensure custom_profile.py exists
-from logger import Logger
+from startup_profile import startup_profiler, audit_imports
 
-# Initialize the logger
-app_logger = Logger()
+def parse_args(argv=None):
+    '''
+    Parse the command-line options.
+    '''
+    parser = argparse.ArgumentParser(description='Run the Project-001 custom profile.')
+    parser.add_argument('--batch', metavar='FILE', help="Run commands from FILE ('-' for stdin) without prompting")
+    parser.add_argument('--json', action='store_true', help='Write one JSON object per command result in batch mode')
+    policy = parser.add_mutually_exclusive_group()
+    policy.add_argument('--fail-fast', dest='fail_fast', action='store_true', help='Stop the batch at the first failing command')
+    policy.add_argument('--continue', dest='fail_fast', action='store_false', help='Keep going after failures (default)')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='Time each startup phase, audit import times, print the report to stderr and exit')
+    parser.add_argument('--trace', metavar='FILE',
+                        help='Record timing spans of the hot paths, write them to FILE as Chrome trace-event JSON and print a latency summary to stderr')
+    return parser.parse_args(argv)
 
-def main():
+def main(argv=None):
     '''
     Main entry point to run the custom profile setup.
+    :return: The process exit code.
     '''
+    args = parse_args(argv)
+    if args.profile_startup:
+        return profile_startup()
+    if not args.trace:
+        return run_profile(args)
+    from tracing import tracer
+    tracer.enable()
+    try:
+        return run_profile(args)
+    finally:
+        count = tracer.export_chrome_trace(args.trace)
+        sys.stderr.write(f'{tracer.format_histogram()}\nWrote {count} span(s) to {args.trace}\n')
+
+def run_profile(args):
+    '''
+    Start the custom profile in batch or interactive mode.
+    :param args: The parsed command-line options.
+    :return: The process exit code.
+    '''
+    # Subsystems are imported here rather than at module level so argument errors and --help stay fast
+    from logger import app_logger
+    from custom_profile import CustomProfile
     try:
         app_logger.log_info('Initializing Custom Profile...')
         profile = CustomProfile()
+        if args.batch:
+            if args.batch == '-':
+                return profile.run_batch(sys.stdin, json_lines=args.json, fail_fast=args.fail_fast)
+            with open(args.batch, 'r') as stream:
+                return profile.run_batch(stream, json_lines=args.json, fail_fast=args.fail_fast)
         profile.run()
     except Exception as e:
         app_logger.log_error(f'An error occurred: {e}')
+        return 1
+    return 0
+
+def profile_startup(output=None):
+    '''
+    Run the startup phases once and report their wall time: imports, sink setup,
+    command registry, state load and environment checks, followed by the slowest imports.
+    :param output: Where the report is written. Defaults to sys.stderr.
+    :return: The process exit code.
+    '''
+    output = output or sys.stderr
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    startup_profiler.enabled = True
+    with startup_profiler.phase('imports'):
+        from logger import app_logger
+        from custom_profile import CustomProfile
+        from state_manager import StateManager
+        from env_manager import EnvironmentManager
+        from error_manager import ErrorManager
+    CustomProfile(base_dir)
+    app_logger.log_info('Profiling startup...')
+    with startup_profiler.phase('state load'):
+        StateManager(os.path.join(base_dir, 'logs', 'system_state.json')).load_state()
+    env_error = None
+    with startup_profiler.phase('environment checks'):
+        try:
+            EnvironmentManager(base_dir, app_logger, ErrorManager())._check_versions()
+        except Exception as e:
+            env_error = e
+    output.write(startup_profiler.report() + '\n')
+    if env_error is not None:
+        output.write(f'Environment checks failed: {env_error}\n')
+    output.write('Slowest imports (cumulative):\n')
+    for module, _, cumulative_us in audit_imports('custom_profile', cwd=base_dir):
+        output.write(f'  {module:<40} {cumulative_us / 1000:9.2f} ms\n')
+    return 0
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -0,0 +1,136 @@
+import threading
+
+# Upper bounds (seconds) of the histogram buckets used for durations
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0)
+
+
+class Metrics:
+    """
+    A small thread-safe registry of counters, gauges and histograms that renders
+    in the Prometheus text exposition format.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._meta = {}  # Metric name -> (type, help text)
+        self._counters = {}  # (name, labels) -> value
+        self._gauges = {}  # (name, labels) -> value
+        self._histograms = {}  # (name, labels) -> [bucket counts..., sum, count]
+
+    def _register(self, name, metric_type, help_text):
+        if name not in self._meta:
+            self._meta[name] = (metric_type, help_text or name.replace("_", " "))
+
+    def inc(self, name, value=1, help_text=None, **labels):
+        """
+        Increment a counter.
+        :param name: Metric name.
+        :param value: Amount to add.
+        :param help_text: Optional description shown in the exposition.
+        :param labels: Label names and values.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._register(name, "counter", help_text)
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name, value, help_text=None, **labels):
+        """
+        Set a gauge to a value.
+        :param name: Metric name.
+        :param value: The new value.
+        :param help_text: Optional description shown in the exposition.
+        :param labels: Label names and values.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._register(name, "gauge", help_text)
+            self._gauges[key] = value
+
+    def observe(self, name, value, help_text=None, **labels):
+        """
+        Record an observation (usually a duration in seconds) in a histogram.
+        :param name: Metric name.
+        :param value: The observed value.
+        :param help_text: Optional description shown in the exposition.
+        :param labels: Label names and values.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._register(name, "histogram", help_text)
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [0] * (len(DEFAULT_BUCKETS) + 2)
+            for i, bound in enumerate(DEFAULT_BUCKETS):
+                if value <= bound:
+                    histogram[i] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def get(self, name, **labels):
+        """
+        Read the current value of a counter or gauge, or the observation count of a histogram.
+        :param name: Metric name.
+        :param labels: Label names and values.
+        :return: The value, or 0 if nothing was recorded.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            if key in self._histograms:
+                return self._histograms[key][-1]
+            return self._counters.get(key, self._gauges.get(key, 0))
+
+    def reset(self):
+        """
+        Forget all recorded values.
+        """
+        with self._lock:
+            self._meta.clear()
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def render_prometheus(self):
+        """
+        Render all metrics in the Prometheus text exposition format.
+        :return: The exposition text.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            histograms = {key: list(values) for key, values in self._histograms.items()}
+            meta = dict(self._meta)
+
+        lines = []
+        for name in sorted(meta):
+            metric_type, help_text = meta[name]
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            if metric_type == "histogram":
+                for (metric, labels), values in sorted(histograms.items()):
+                    if metric != name:
+                        continue
+                    for bound, count in zip(DEFAULT_BUCKETS, values):
+                        lines.append(f"{name}_bucket{_format_labels(labels + (('le', repr(bound)),))} {count}")
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {values[-1]}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {values[-2]}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {values[-1]}")
+            else:
+                source = counters if metric_type == "counter" else gauges
+                for (metric, labels), value in sorted(source.items()):
+                    if metric == name:
+                        lines.append(f"{name}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = []
+    for key, value in labels:
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        escaped.append(f'{key}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+# Global instance of the Metrics registry
+app_metrics = Metrics()
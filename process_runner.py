@@ -0,0 +1,159 @@
+import os
+import time
+import signal
+import threading
+import contextvars
+import subprocess
+from collections import deque
+from logger import app_logger
+from metrics import app_metrics
+
+DEFAULT_TIMEOUT = 600  # Seconds before a command is killed, unless the call sets its own timeout
+KILL_GRACE_PERIOD = 5  # Seconds between SIGTERM and SIGKILL
+OUTPUT_TAIL_LINES = 200  # Lines of output kept per stream for the returned result
+CANCEL_POLL_INTERVAL = 0.1  # Seconds between checks of the cancel event while a command runs
+
+# Event that, once set, kills the command running in the current context. Background jobs set it
+cancel_event = contextvars.ContextVar("cancel_event", default=None)
+
+
+class CommandCancelled(Exception):
+    """
+    Raised when a command is killed because its cancel event was set.
+    """
+
+
+class ProcessRunner:
+    """
+    Runs external commands for the managers.
+    Output is streamed line by line into the logger rather than buffered, commands are killed
+    (with their whole process group) when they time out, and a shared semaphore limits how many
+    commands run at once. Tests substitute a FaultInjector.
+    """
+
+    def __init__(self, default_timeout=DEFAULT_TIMEOUT, max_concurrent=4, logger=app_logger):
+        """
+        Initialize the ProcessRunner.
+        :param default_timeout: Seconds a command may run when the call does not set a timeout. None waits forever.
+        :param max_concurrent: Maximum number of commands running at once.
+        :param logger: Receives the commands' output.
+        """
+        self.default_timeout = default_timeout
+        self.logger = logger
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+
+    def run(self, command, cwd=None, check=False, timeout=None):
+        """
+        Run a command, streaming its output into the logger.
+        :param command: The command as a list of arguments.
+        :param cwd: Working directory for the command.
+        :param check: Raise subprocess.CalledProcessError if the command exits with a non-zero code.
+        :param timeout: Seconds before the command is killed. Defaults to default_timeout.
+        :return: A subprocess.CompletedProcess whose stdout and stderr hold the last OUTPUT_TAIL_LINES lines of each stream.
+        Raises subprocess.TimeoutExpired if the command was killed, or CommandCancelled if the cancel_event
+        of the calling context was set.
+        """
+        timeout = self.default_timeout if timeout is None else timeout
+        cancel = cancel_event.get()
+        label = command_label(command)
+        stdout_tail = deque(maxlen=OUTPUT_TAIL_LINES)
+        stderr_tail = deque(maxlen=OUTPUT_TAIL_LINES)
+        with self._semaphore:
+            start = time.perf_counter()
+            process = subprocess.Popen(command, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                                       bufsize=1, errors="replace", start_new_session=hasattr(os, "killpg"))
+            # The readers run in a copy of the caller's context, so its log context (e.g. a job id) applies to the output
+            readers = [
+                threading.Thread(target=contextvars.copy_context().run,
+                                 args=(self._pump, process.stdout, label, stdout_tail, self.logger.log_info), daemon=True),
+                threading.Thread(target=contextvars.copy_context().run,
+                                 args=(self._pump, process.stderr, label, stderr_tail, self.logger.log_warning), daemon=True)
+            ]
+            for reader in readers:
+                reader.start()
+            outcome = self._wait(process, start, timeout, cancel)
+            returncode = process.returncode
+            for reader in readers:
+                reader.join(KILL_GRACE_PERIOD)  # A surviving grandchild could hold the pipes open
+            elapsed = time.perf_counter() - start
+
+        outcome = outcome or str(returncode)
+        app_metrics.observe("subprocess_seconds", elapsed, help_text="Duration of external commands", command=label)
+        app_metrics.inc("subprocess_runs_total", help_text="External commands run, by exit code", command=label, exit_code=outcome)
+        stdout, stderr = "\n".join(stdout_tail), "\n".join(stderr_tail)
+        if outcome == "timeout":
+            self.logger.log_error(f"{label} timed out after {timeout}s and was killed.", context="ProcessRunner")
+            raise subprocess.TimeoutExpired(command, timeout, stdout, stderr)
+        if outcome == "cancelled":
+            self.logger.log_warning(f"{label} was cancelled and killed.", context="ProcessRunner")
+            raise CommandCancelled(f"{label} was cancelled.")
+        self.logger.log_info(f"{label} exited with code {returncode} in {elapsed:.2f}s", context="ProcessRunner")
+        if check and returncode != 0:
+            raise subprocess.CalledProcessError(returncode, command, stdout, stderr)
+        return subprocess.CompletedProcess(command, returncode, stdout, stderr)
+
+    def _wait(self, process, start, timeout, cancel):
+        """
+        Wait for a command, killing it if it times out or is cancelled.
+        :return: "timeout", "cancelled", or None if the command exited by itself.
+        """
+        while True:
+            remaining = None if timeout is None else max(0, start + timeout - time.perf_counter())
+            if cancel is not None:
+                remaining = CANCEL_POLL_INTERVAL if remaining is None else min(remaining, CANCEL_POLL_INTERVAL)
+            try:
+                process.wait(timeout=remaining)
+                return None
+            except subprocess.TimeoutExpired:
+                if cancel is not None and cancel.is_set():
+                    self._kill(process)
+                    return "cancelled"
+                if timeout is not None and time.perf_counter() - start >= timeout:
+                    self._kill(process)
+                    return "timeout"
+
+    def _pump(self, stream, label, tail, log):
+        """
+        Forward a stream to the logger line by line, keeping the last lines.
+        """
+        for line in stream:
+            line = line.rstrip("\n")
+            tail.append(line)
+            log(f"{label}: {line}", context="ProcessRunner")
+        stream.close()
+
+    def _kill(self, process):
+        """
+        Terminate a command and everything it started, escalating to SIGKILL after the grace period.
+        """
+        self._signal(process, signal.SIGTERM)
+        try:
+            process.wait(timeout=KILL_GRACE_PERIOD)
+        except subprocess.TimeoutExpired:
+            pass
+        # Kill whatever is left of the group, including children that outlived the command
+        self._signal(process, getattr(signal, "SIGKILL", signal.SIGTERM))
+        process.wait()
+
+    def _signal(self, process, sig):
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(process.pid, sig)  # The command leads its own session, so its pid is the group id
+            else:
+                process.send_signal(sig)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+def command_label(command):
+    """
+    Name a command for logs and metrics: the program, plus its subcommand if it has one (e.g. "npm install").
+    :param command: The command as a list of arguments.
+    """
+    label = os.path.basename(command[0])
+    if len(command) > 1 and command[1].isalpha():
+        label += f" {command[1]}"
+    return label
+
+# Global instance of the ProcessRunner, shared so its semaphore limits every caller
+default_runner = ProcessRunner()
@@ -1,15 +1,11 @@
-from logger import logger
-from error_manager import ErrorManager
-from env_manager import EnvironmentManager
+from logger import logger, app_logger
 from state_manager import StateManager
 
 def main():
     base_dir = "/Users/crashair/AI-Software/_Interpreter/Projects/Project-001/"
     
-    # Initialize managers
-    error_manager = ErrorManager()  # No longer passing logger
+    # Only the state is needed on every run; the other managers are built when setup is required
     state_manager = StateManager()
-    env_manager = EnvironmentManager(base_dir, logger, error_manager)
 
     # Log start of program
     logger.info("Starting Project-001 Profile...")
@@ -17,14 +13,25 @@ def main():
     # Check session state
     state_manager.load_state()
     if not state_manager.get_value("initialized"):
+        from error_manager import ErrorManager
+        from env_manager import EnvironmentManager
+        error_manager = ErrorManager()  # No longer passing logger
+        env_manager = EnvironmentManager(base_dir, app_logger, error_manager)
         logger.info("Environment not initialized. Setting it up now...")
-        try:
-            env_manager.setup_environment()
+        if env_manager.setup_environment():
             state_manager.update_state("initialized", True)
             logger.info("Environment setup successfully completed.")
-        except Exception as e:
-            logger.error(f"An error occurred during environment setup: {e}")
-            error_manager.handle_error(lambda: env_manager.setup_environment(), "failed_npm_install")
+        else:
+            logger.error(f"An error occurred during environment setup: {env_manager.last_error}")
+
+            def retry_setup():
+                if not env_manager.setup_environment():
+                    raise Exception(env_manager.last_error)
+
+            # Raises if recovery fails, so a failed setup is never recorded as initialized
+            error_manager.handle_error(retry_setup, "failed_npm_install")
+            state_manager.update_state("initialized", True)
+            logger.info("Environment setup completed after recovery.")
     
     # Main functionality placeholder
     logger.info("Running main functionality...")
@@ -0,0 +1,71 @@
+import os
+from collections import deque
+
+try:
+    import readline
+except ImportError:  # Not available on Windows
+    readline = None
+
+
+class CommandHistory:
+    """
+    A persistent, size-capped REPL history kept in an append-only file with one command per line.
+    """
+
+    def __init__(self, path, max_entries=1000):
+        """
+        Load the history and hand it to readline, if available.
+        :param path: Path to the history file.
+        :param max_entries: Number of commands kept. The file is compacted once it holds twice as many.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.entries = deque(maxlen=max_entries)
+        self._lines_in_file = 0
+        if os.path.exists(path):
+            with open(path, "r", errors="replace") as f:
+                for line in f:
+                    self._lines_in_file += 1
+                    self.entries.append(line.rstrip("\n"))
+        if readline:
+            readline.clear_history()
+            readline.set_history_length(max_entries)
+            for command in self.entries:
+                readline.add_history(command)
+
+    def append(self, command, add_to_readline=False):
+        """
+        Record a command.
+        :param command: The command line.
+        :param add_to_readline: Also add it to readline's in-memory history (input() already does this).
+        """
+        command = command.strip()
+        if not command or "\n" in command or (self.entries and self.entries[-1] == command):
+            return
+        self.entries.append(command)
+        if readline and add_to_readline:
+            readline.add_history(command)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(command + "\n")
+        self._lines_in_file += 1
+        if self._lines_in_file > 2 * self.max_entries:
+            self.compact()
+
+    def compact(self):
+        """
+        Rewrite the history file with only the most recent max_entries commands.
+        """
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            f.writelines(command + "\n" for command in self.entries)
+        os.replace(temp_path, self.path)
+        self._lines_in_file = len(self.entries)
+
+    def recent(self, count=20):
+        """
+        Return the most recent commands.
+        :param count: How many commands to return.
+        :return: A list of commands, oldest first.
+        """
+        return list(self.entries)[-int(count):]
@@ -0,0 +1,105 @@
+import os
+import glob
+import time
+import threading
+from collections import OrderedDict
+from metrics import app_metrics
+
+_MISSING = object()
+
+
+class ResultCache:
+    """
+    An LRU cache with a time-to-live for the results of idempotent commands.
+    """
+
+    def __init__(self, max_entries=256, ttl=300):
+        """
+        Initialize the ResultCache.
+        :param max_entries: Maximum number of cached results; the least recently used is evicted first.
+        :param ttl: Seconds a result stays valid.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # Key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def lookup(self, key):
+        """
+        Look up a cached result.
+        :param key: The cache key.
+        :return: A (hit, value) tuple. value is None on a miss or when the entry has expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                hit = True
+            else:
+                if entry is not _MISSING:
+                    del self._entries[key]  # Expired
+                self.misses += 1
+                hit = False
+        app_metrics.inc("result_cache_requests_total", help_text="Lookups in the command result cache", outcome="hit" if hit else "miss")
+        return (True, entry[1]) if hit else (False, None)
+
+    def put(self, key, value):
+        """
+        Cache a result, evicting the least recently used entries if the cache is full.
+        :param key: The cache key.
+        :param value: The result.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Drop every cached result.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Report the cache's effectiveness.
+        :return: A dictionary with hits, misses, hit_rate, evictions and entries.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries)
+            }
+
+
+def file_fingerprint(base_dir, patterns):
+    """
+    Fingerprint the files a command reads, so cached results are dropped as soon as an input changes.
+    :param base_dir: Directory the patterns are relative to.
+    :param patterns: File paths or glob patterns.
+    :return: A hashable tuple of (path, inode, size, mtime_ns) entries. Missing files are included as (pattern, None).
+    """
+    fingerprint = []
+    for pattern in patterns:
+        paths = sorted(glob.glob(os.path.join(base_dir, pattern), recursive=True))
+        if not paths:
+            fingerprint.append((pattern, None))
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                fingerprint.append((path, None))
+                continue
+            fingerprint.append((path, stat.st_ino, stat.st_size, stat.st_mtime_ns))
+    return tuple(fingerprint)
@@ -0,0 +1,26 @@
+from logger import app_logger
+from error_manager import ErrorManager
+from env_manager import EnvironmentManager
+
+def setup(profile):
+    """
+    Run the full environment setup (directories, version checks, npm install).
+    :param profile: The CustomProfile running the command.
+    :return: A completion message.
+    Raises an Exception with the cause if the setup failed, so the REPL, jobs and batch mode report a failure.
+    """
+    env_manager = EnvironmentManager(profile.base_dir, app_logger, ErrorManager(base_dir=profile.base_dir))
+    if not env_manager.setup_environment():
+        raise Exception(f"Environment setup failed: {env_manager.last_error}")
+    return "Environment setup finished."
+
+def npm_recover(profile):
+    """
+    Clean the npm cache and reinstall dependencies from scratch.
+    :param profile: The CustomProfile running the command.
+    :return: A completion message.
+    """
+    error_manager = ErrorManager(base_dir=profile.base_dir)
+    error_manager.rebuild_cache()
+    error_manager.reinstall_dependencies()
+    return "npm recovery finished."
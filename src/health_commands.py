@@ -0,0 +1,26 @@
+from health_check import HealthCheck
+
+def _format_results(results):
+    lines = []
+    for file_name, result in results.items():
+        status = "ok" if result["valid"] else "FAILED"
+        if result["valid"] and not result["permissions_ok"]:
+            status += " (permissions fixed)"
+        lines.append(f"{file_name}: {status}")
+    return "\n".join(lines)
+
+def health(profile):
+    """
+    Run a health check, reusing cached results for unchanged files.
+    :param profile: The CustomProfile running the command.
+    :return: One status line per file.
+    """
+    return _format_results(HealthCheck(profile.base_dir).run_health_check())
+
+def recover(profile):
+    """
+    Fully re-check every file and run recovery for the ones that fail.
+    :param profile: The CustomProfile running the command.
+    :return: One status line per file.
+    """
+    return _format_results(HealthCheck(profile.base_dir).run_health_check(force=True))
@@ -0,0 +1,16 @@
+import os
+import json
+from state_manager import StateManager
+
+def show_state(profile, key=None):
+    """
+    Show the saved state, or the value of a single key.
+    :param profile: The CustomProfile running the command.
+    :param key: Optional state key.
+    :return: The state as indented JSON.
+    """
+    state_manager = StateManager(os.path.join(profile.base_dir, "logs", "system_state.json"))
+    state_manager.load_state()
+    if key is not None:
+        return json.dumps(state_manager.get_value(key), indent=4)
+    return json.dumps(state_manager.get_state(), indent=4)
@@ -0,0 +1,88 @@
+import sys
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """
+    Records the wall time of named startup phases.
+    Disabled by default, in which case phases cost a single attribute check.
+    """
+
+    def __init__(self, enabled=False):
+        """
+        Initialize the StartupProfiler.
+        :param enabled: Record phases. Can also be switched on later.
+        """
+        self.enabled = enabled
+        self.phases = {}  # Phase name -> seconds, in the order phases first ran
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a block of startup work. Repeated phases with the same name are added up.
+        :param name: The phase name, e.g. "imports".
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def total(self):
+        """
+        :return: The combined wall time of all phases in seconds.
+        """
+        return sum(self.phases.values())
+
+    def report(self):
+        """
+        Format the per-phase breakdown.
+        :return: One line per phase followed by the total.
+        """
+        total = self.total()
+        lines = ["Startup profile:"]
+        for name, seconds in self.phases.items():
+            share = seconds / total if total else 0.0
+            lines.append(f"  {name:<20} {seconds * 1000:9.2f} ms {share:7.1%}")
+        lines.append(f"  {'total':<20} {total * 1000:9.2f} ms")
+        return "\n".join(lines)
+
+
+def parse_importtime(output):
+    """
+    Parse the report written by "python -X importtime".
+    :param output: The stderr text of the interpreter.
+    :return: A list of (module, self_us, cumulative_us) tuples in import order.
+    """
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            modules.append((name.strip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return modules
+
+
+def audit_imports(module, cwd=None, limit=10):
+    """
+    Import a module in a fresh interpreter and report the slowest imports it pulls in.
+    :param module: Name of the module to import.
+    :param cwd: Directory to run the interpreter in.
+    :param limit: Number of modules to report.
+    :return: A list of (module, self_us, cumulative_us) tuples, slowest cumulative time first.
+    """
+    import subprocess
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=cwd, capture_output=True, text=True)
+    modules = parse_importtime(result.stderr)
+    return sorted(modules, key=lambda entry: entry[2], reverse=True)[:limit]
+
+# Global instance of the StartupProfiler
+startup_profiler = StartupProfiler()
@@ -1,6 +1,9 @@
 import json
 import os
+import time
 from logger import app_logger
+from metrics import app_metrics
+from tracing import tracer
 
 class StateManager:
     """
@@ -12,19 +15,10 @@ class StateManager:
         """
         Initialize the StateManager with the path to the state file.
         If no state file is provided, it defaults to system_state.json in the logs directory.
+        The file is not touched until the state is loaded or saved.
         """
         self.state_file = state_file or '/Users/crashair/AI-Software/_Interpreter/Projects/Project-001/logs/system_state.json'
         self.state = {}
-        self._initialize_state_file()
-
-    def _initialize_state_file(self):
-        """
-        Ensure that the state file exists and has an initial state if it doesn't already.
-        """
-        if not os.path.exists(self.state_file):
-            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
-            with open(self.state_file, 'w') as f:
-                json.dump({}, f)
 
     def load_state(self):
         """
@@ -41,13 +35,17 @@ class StateManager:
             app_logger.log_info("State file not found. Starting with an empty state.")
             self.state = {}
 
+    @tracer.traced()
     def save_state(self):
         """
         Save the current state to the JSON file.
         """
+        start = time.perf_counter()
         try:
+            os.makedirs(os.path.dirname(self.state_file) or '.', exist_ok=True)
             with open(self.state_file, 'w') as f:
                 json.dump(self.state, f, indent=4)
+            app_metrics.observe("state_save_seconds", time.perf_counter() - start, help_text="Time taken to save the state file")
             app_logger.log_info("State successfully saved.")
         except Exception as e:
             app_logger.log_error(f"Error saving state: {e}")
@@ -0,0 +1,246 @@
+import re
+import json
+import codecs
+import hashlib
+
+DEFAULT_CHUNK_SIZE = 64 * 1024  # Bytes read per chunk
+MAX_NESTING_DEPTH = 10000  # Deepest JSON nesting accepted, bounds the checker's stack
+MAX_SCALAR_LENGTH = 4096  # Longest number or literal accepted, bounds the carry-over buffer
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING_RUN = re.compile(r'[^"\\\x00-\x1f]*')
+_STRING_BODY = re.compile(r'[^"\\\x00-\x1f]*(?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})[^"\\\x00-\x1f]*)*"')  # Rest of a string, closing quote included
+_SCALAR_RUN = re.compile(r'[^ \t\n\r,:\[\]{}"]*')
+_NUMBER = re.compile(r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?")
+_LITERALS = ("true", "false", "null", "NaN", "Infinity", "-Infinity")  # Everything json.load accepts
+_HEX_DIGITS = set("0123456789abcdefABCDEF")
+
+# Parser states: what the checker expects to see next
+_VALUE = "value"
+_VALUE_OR_END = "value_or_end"  # Right after "["
+_KEY = "key"
+_KEY_OR_END = "key_or_end"  # Right after "{"
+_COLON = "colon"
+_COMMA_OR_END = "comma_or_end"
+_DONE = "done"
+
+
+class JsonSyntaxChecker:
+    """
+    An incremental JSON syntax checker.
+    Text is fed in chunks of any size; memory use is bounded by the nesting depth, never by the document size.
+    """
+
+    def __init__(self):
+        self.stack = []  # Open containers, "{" or "["
+        self.expect = _VALUE
+        self.offset = 0  # Characters consumed by earlier chunks, for error messages
+        self.in_string = False
+        self.string_is_key = False
+        self.escape = ""  # Partial escape sequence carried across chunks
+        self.scalar = ""  # Partial number or literal carried across chunks
+
+    def _fail(self, message, position):
+        raise ValueError(f"Invalid JSON at character {self.offset + position}: {message}")
+
+    def _end_value(self):
+        self.expect = _COMMA_OR_END if self.stack else _DONE
+
+    def _end_scalar(self, position):
+        token = self.scalar
+        self.scalar = ""
+        if token not in _LITERALS and not _NUMBER.fullmatch(token):
+            self._fail(f"unexpected token {token[:32]!r}", position)
+        self._end_value()
+
+    def _feed_escape(self, text, i):
+        """
+        Consume the characters of an escape sequence inside a string.
+        :return: The index after the consumed characters.
+        """
+        n = len(text)
+        while i < n:
+            char = text[i]
+            i += 1
+            self.escape += char
+            if len(self.escape) == 2:
+                if char == "u":
+                    continue
+                if char not in '"\\/bfnrt':
+                    self._fail(f"invalid escape {self.escape!r}", i - 1)
+                self.escape = ""
+                return i
+            if char not in _HEX_DIGITS:
+                self._fail(f"invalid unicode escape {self.escape!r}", i - 1)
+            if len(self.escape) == 6:
+                self.escape = ""
+                return i
+        return i
+
+    def feed(self, text):
+        """
+        Check the next chunk of the document.
+        :param text: The decoded text of the chunk.
+        Raises ValueError at the first syntax error.
+        """
+        i = 0
+        n = len(text)
+        while i < n:
+            if self.in_string:
+                if self.escape:
+                    i = self._feed_escape(text, i)
+                    continue
+                i = _STRING_RUN.match(text, i).end()
+                if i >= n:
+                    break
+                char = text[i]
+                if char == '"':
+                    self.in_string = False
+                    i += 1
+                    if self.string_is_key:
+                        self.expect = _COLON
+                    else:
+                        self._end_value()
+                elif char == "\\":
+                    self.escape = "\\"
+                    i += 1
+                else:
+                    self._fail("control character in string", i)
+                continue
+
+            if self.scalar:
+                end = _SCALAR_RUN.match(text, i).end()
+                self.scalar += text[i:end]
+                if len(self.scalar) > MAX_SCALAR_LENGTH:
+                    self._fail("token too long", end)
+                i = end
+                if i >= n:
+                    break
+                self._end_scalar(i)
+                continue
+
+            char = text[i]
+            if char in " \t\n\r":
+                i = _WHITESPACE.match(text, i).end()
+                continue
+            if self.expect == _DONE:
+                self._fail("extra data after document", i)
+
+            if char == '"':
+                if self.expect in (_KEY, _KEY_OR_END):
+                    self.string_is_key = True
+                elif self.expect in (_VALUE, _VALUE_OR_END):
+                    self.string_is_key = False
+                else:
+                    self._fail("unexpected string", i)
+                match = _STRING_BODY.match(text, i + 1)
+                if match:
+                    # Fast path: the whole string is inside this chunk
+                    i = match.end()
+                    if self.string_is_key:
+                        self.expect = _COLON
+                    else:
+                        self._end_value()
+                else:
+                    self.in_string = True
+                    i += 1
+            elif char in "{[":
+                if self.expect not in (_VALUE, _VALUE_OR_END):
+                    self._fail(f"unexpected {char!r}", i)
+                if len(self.stack) >= MAX_NESTING_DEPTH:
+                    self._fail("document nested too deeply", i)
+                self.stack.append(char)
+                self.expect = _KEY_OR_END if char == "{" else _VALUE_OR_END
+                i += 1
+            elif char in "}]":
+                opener = "{" if char == "}" else "["
+                allowed = (_KEY_OR_END, _COMMA_OR_END) if char == "}" else (_VALUE_OR_END, _COMMA_OR_END)
+                if not self.stack or self.stack[-1] != opener or self.expect not in allowed:
+                    self._fail(f"unexpected {char!r}", i)
+                self.stack.pop()
+                self._end_value()
+                i += 1
+            elif char == ":":
+                if self.expect != _COLON:
+                    self._fail("unexpected ':'", i)
+                self.expect = _VALUE
+                i += 1
+            elif char == ",":
+                if self.expect != _COMMA_OR_END:
+                    self._fail("unexpected ','", i)
+                self.expect = _KEY if self.stack[-1] == "{" else _VALUE
+                i += 1
+            else:
+                if self.expect not in (_VALUE, _VALUE_OR_END):
+                    self._fail(f"unexpected {char!r}", i)
+                end = _SCALAR_RUN.match(text, i).end()
+                self.scalar = text[i:end]
+                if len(self.scalar) > MAX_SCALAR_LENGTH:
+                    self._fail("token too long", end)
+                i = end
+                if i < n:
+                    self._end_scalar(i)
+        self.offset += n
+
+    def close(self):
+        """
+        Signal the end of the document.
+        Raises ValueError if the document is incomplete.
+        """
+        if self.scalar:
+            self._end_scalar(0)
+        if self.in_string or self.expect != _DONE:
+            self._fail("unexpected end of document", 0)
+
+
+def validate_stream(file_path, validator, chunk_size=DEFAULT_CHUNK_SIZE, max_bytes=None, expected_sha256=None, encoding="utf-8", hasher=None):
+    """
+    Validate a file in fixed-size chunks, in constant memory.
+    :param file_path: Path to the file to validate.
+    :param validator: "json" (syntax check), "text" (decodes cleanly) or "exists" (checksum only).
+    :param chunk_size: Bytes read per chunk.
+    :param max_bytes: Stop inspecting content after this many bytes. None inspects the whole file.
+    :param expected_sha256: Hex digest the file must match. The whole file is hashed regardless of max_bytes.
+    :param encoding: Text encoding of the file.
+    :param hasher: Optional hashlib.sha256() object updated with the bytes read, so callers get the digest for free.
+        Reading stops at max_bytes unless expected_sha256 is set, so the digest only covers the whole file if it was not truncated.
+    :return: The number of bytes whose content was inspected.
+    Raises ValueError (or UnicodeDecodeError) if the file is invalid, IOError if it cannot be read.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)() if validator in ("json", "text") else None
+    checker = JsonSyntaxChecker() if validator == "json" else None
+    if hasher is None and expected_sha256:
+        hasher = hashlib.sha256()
+    inspected = 0
+    truncated = False
+    with open(file_path, "rb") as f:
+        chunk = f.read(chunk_size)
+        if checker and len(chunk) < chunk_size and (max_bytes is None or len(chunk) <= max_bytes):
+            # The whole file fits in one chunk, so the faster C parser is still bounded in memory
+            json.loads(chunk.decode(encoding))
+            inspected = len(chunk)
+            checker = None
+            decoder = None
+        while chunk:
+            if hasher is not None:
+                hasher.update(chunk)
+            if decoder and not truncated:
+                if max_bytes is not None and inspected + len(chunk) > max_bytes:
+                    chunk = chunk[:max_bytes - inspected]
+                    truncated = True
+                inspected += len(chunk)
+                text = decoder.decode(chunk)
+                if checker:
+                    checker.feed(text)
+            if truncated and not expected_sha256:
+                break  # Only an expected checksum justifies reading past the cap
+            if decoder is None and hasher is None:
+                break  # Nothing left to inspect or hash
+            chunk = f.read(chunk_size)
+    if decoder and not truncated:
+        decoder.decode(b"", final=True)
+        if checker:
+            checker.close()
+    if expected_sha256 and hasher.hexdigest() != expected_sha256.lower():
+        raise ValueError(f"Checksum mismatch: expected {expected_sha256}, found {hasher.hexdigest()}")
+    return inspected
@@ -0,0 +1,111 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from backup_store import BackupStore
+from health_check import HealthCheck
+
+class TestBackupStore(unittest.TestCase):
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp()
+        self.store = BackupStore(os.path.join(self.base_dir, "backups"), keep_versions=2, gc_every=0, grace_period=0)
+        self.path = os.path.join(self.base_dir, "state.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.base_dir)
+
+    def _snapshot(self, content):
+        with open(self.path, 'w') as f:
+            f.write(content)
+        digest = self.store.store_blob(self.path)
+        self.store.record_snapshot({"state.json": digest})
+        return digest
+
+    def _blob_count(self):
+        return sum(len(files) for _, _, files in os.walk(self.store.blobs_dir))
+
+    def test_identical_content_is_stored_once(self):
+        first = self._snapshot('{"a": 1}')
+        second = self._snapshot('{"a": 1}')
+        self.assertEqual(first, second)
+        self.assertEqual(self._blob_count(), 1)
+        self.assertEqual(self.store.versions("state.json"), [first])
+
+    def test_restore_picks_newest_valid_version(self):
+        good = self._snapshot('{"a": 1}')
+        self._snapshot('{"a": 2}')
+
+        def validate(blob_path):
+            with open(blob_path, 'r') as f:
+                return json.load(f)["a"] == 1
+        with open(self.path, 'w') as f:
+            f.write("{broken")
+        self.assertEqual(self.store.restore("state.json", self.path, validate), good)
+        with open(self.path, 'r') as f:
+            self.assertEqual(json.load(f), {"a": 1})
+
+    def test_garbage_collection_keeps_n_versions(self):
+        digests = [self._snapshot(json.dumps({"a": i})) for i in range(4)]
+        self._snapshot(json.dumps({"a": 3}))
+        self.store.garbage_collect()
+        self.assertEqual(self.store.versions("state.json"), [digests[3], digests[2]])
+        self.assertEqual(self._blob_count(), 2)
+        self.assertEqual(len(self.store.snapshots()), 2)
+
+    def test_garbage_collection_keeps_blobs_not_yet_recorded(self):
+        self._snapshot('{"a": 1}')
+        # Another process has stored a blob but not yet recorded its snapshot
+        other = BackupStore(self.store.root, keep_versions=2, gc_every=0)
+        with open(self.path, 'w') as f:
+            f.write('{"a": 2}')
+        pending = other.store_blob(self.path)
+        BackupStore(self.store.root, keep_versions=2, gc_every=0).garbage_collect()
+        self.assertTrue(os.path.exists(self.store.blob_path(pending)))
+        other.record_snapshot({"state.json": pending})
+        self.assertEqual(self.store.versions("state.json")[0], pending)
+        # Once the grace period is over an unreferenced blob is collected
+        orphan = os.path.join(self.base_dir, "orphan.json")
+        with open(orphan, 'w') as f:
+            f.write('{"orphan": true}')
+        digest = other.store_blob(orphan)
+        os.utime(self.store.blob_path(digest), (0, 0))
+        self.assertEqual(BackupStore(self.store.root, gc_every=0).garbage_collect(), 1)
+        self.assertFalse(os.path.exists(self.store.blob_path(digest)))
+
+class TestHealthCheckBackups(unittest.TestCase):
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.base_dir, "configs"))
+        with open(os.path.join(self.base_dir, "configs", "health_check.json"), 'w') as f:
+            json.dump({"files": [{"pattern": "package.json", "recovery_steps": ["restore_package_json", "create_package_json"]}]}, f)
+        self.package_json = os.path.join(self.base_dir, "package.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.base_dir)
+
+    def _write(self, content):
+        with open(self.package_json, 'w') as f:
+            f.write(content)
+        os.chmod(self.package_json, 0o644)
+
+    def test_corrupted_file_is_restored_from_backup_store(self):
+        self._write('{"name": "real-project", "version": "2.0.0"}')
+        HealthCheck(self.base_dir).run_health_check()
+        self._write('{"name": "real-project", "vers')
+
+        results = HealthCheck(self.base_dir).run_health_check()
+        self.assertTrue(results["package.json"]["valid"])
+        with open(self.package_json, 'r') as f:
+            self.assertEqual(json.load(f)["name"], "real-project")
+
+    def test_files_larger_than_the_inspection_cap_are_not_backed_up(self):
+        with open(os.path.join(self.base_dir, "configs", "health_check.json"), 'w') as f:
+            json.dump({"max_validate_bytes": 100, "files": [{"pattern": "package.json", "recovery_steps": []}]}, f)
+        self._write(json.dumps({"name": "large", "padding": "x" * 1000}))
+        health_check = HealthCheck(self.base_dir)
+        self.assertTrue(health_check.run_health_check()["package.json"]["valid"])
+        self.assertEqual(health_check.backup_store.snapshots(), [])
+
+if __name__ == '__main__':
+    unittest.main()
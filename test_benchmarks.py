@@ -0,0 +1,53 @@
+import os
+import sys
+import json
+import tempfile
+import subprocess
+import unittest
+from benchmarks import compare, DEFAULT_BASELINE
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCHMARKS = os.path.join(BASE_DIR, "benchmarks.py")
+
+def _run(results):
+    return {"results": {name: {"seconds": seconds, "unit": "op"} for name, seconds in results.items()}}
+
+class TestCompare(unittest.TestCase):
+    def test_flags_slowdowns_beyond_threshold(self):
+        baseline = _run({"fast": 1.0, "slow": 1.0, "removed": 1.0})
+        current = _run({"fast": 0.5, "slow": 1.3, "added": 1.0})
+        rows = {row[0]: row for row in compare(current, baseline, threshold=0.25)}
+        self.assertEqual(set(rows), {"fast", "slow"})
+        self.assertFalse(rows["fast"][4])
+        self.assertTrue(rows["slow"][4])
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_quick_suite_writes_and_compares_baseline(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            baseline = os.path.join(temp_dir, "baseline.json")
+            subprocess.run([sys.executable, BENCHMARKS, "--quick", "--output", baseline],
+                           cwd=temp_dir, capture_output=True, text=True, check=True, timeout=120)
+            with open(baseline) as f:
+                results = json.load(f)["results"]
+            for name in ("state_update_1000", "logger_queued_call", "recovery_loop_success", "health_check_warm_100"):
+                self.assertGreater(results[name]["seconds"], 0)
+            # A huge threshold keeps timing noise from failing the test; only the compare path is exercised
+            result = subprocess.run([sys.executable, BENCHMARKS, "--quick", "--only", "recovery_loop",
+                                     "--compare", baseline, "--threshold", "100"],
+                                    cwd=temp_dir, capture_output=True, text=True, timeout=120)
+            self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+            self.assertIn("0 regression(s)", result.stdout)
+            self.assertEqual(os.listdir(temp_dir), ["baseline.json"])
+
+    @unittest.skipUnless(os.environ.get("RUN_BENCHMARKS"), "Set RUN_BENCHMARKS=1 to run the full benchmark suite")
+    def test_full_suite_against_baseline(self):
+        baseline = os.path.join(BASE_DIR, DEFAULT_BASELINE)
+        command = [sys.executable, BENCHMARKS]
+        if os.path.exists(baseline):
+            command += ["--compare", baseline]
+        result = subprocess.run(command, cwd=BASE_DIR, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+
+if __name__ == '__main__':
+    unittest.main()
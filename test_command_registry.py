@@ -0,0 +1,51 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from command_registry import CommandRegistry, CommandError
+
+class TestCommandRegistry(unittest.TestCase):
+    def setUp(self):
+        self.plugin_dir = tempfile.mkdtemp()
+        sys.path.insert(0, self.plugin_dir)
+        with open(os.path.join(self.plugin_dir, "lazy_plugin_for_test.py"), 'w') as f:
+            f.write("def status(profile, *args):\n    return 'status ' + ' '.join(args)\n")
+        self.manifest = os.path.join(self.plugin_dir, "commands.json")
+        with open(self.manifest, 'w') as f:
+            json.dump({"commands": [
+                {"name": "status", "target": "lazy_plugin_for_test:status", "aliases": ["st"]},
+                {"name": "state", "target": "lazy_plugin_for_test:missing"},
+                {"name": "health", "target": "lazy_plugin_for_test:status", "aliases": ["hc"]}
+            ]}, f)
+        self.registry = CommandRegistry()
+
+    def tearDown(self):
+        sys.path.remove(self.plugin_dir)
+        sys.modules.pop("lazy_plugin_for_test", None)
+        shutil.rmtree(self.plugin_dir)
+
+    def test_plugins_are_imported_on_first_use(self):
+        self.assertEqual(self.registry.load_manifest(self.manifest), 3)
+        self.assertNotIn("lazy_plugin_for_test", sys.modules)
+        self.assertEqual(self.registry.dispatch('status a "b c"'), "status a b c")
+        self.assertIn("lazy_plugin_for_test", sys.modules)
+
+    def test_alias_and_prefix_resolution(self):
+        self.registry.load_manifest(self.manifest)
+        self.assertEqual(self.registry.resolve("st"), "status")
+        self.assertEqual(self.registry.resolve("hea"), "health")
+        self.assertEqual(self.registry.resolve("h"), "health")
+        with self.assertRaises(CommandError):
+            self.registry.resolve("sta")  # status or state
+        with self.assertRaises(CommandError):
+            self.registry.resolve("unknown")
+
+    def test_missing_handler_raises_command_error(self):
+        self.registry.load_manifest(self.manifest)
+        with self.assertRaises(CommandError):
+            self.registry.dispatch("state")
+
+if __name__ == '__main__':
+    unittest.main()
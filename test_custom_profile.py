@@ -0,0 +1,76 @@
+import io
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from custom_profile import CustomProfile
+
+class TestCustomProfileBatch(unittest.TestCase):
+    def setUp(self):
+        with mock.patch.object(CustomProfile, "_setup_loggers"):
+            self.profile = CustomProfile()
+        self.profile.registry.register("echo", handler=lambda profile, *args: " ".join(args), help_text="Echo")
+        self.profile.registry.register("fail", handler=lambda profile: 1 / 0, help_text="Fail")
+
+    def test_json_lines_output_and_summary(self):
+        output = io.StringIO()
+        commands = io.StringIO("echo a b\n\n# comment\nfail\necho c\n")
+        exit_code = self.profile.run_batch(commands, output=output, json_lines=True)
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(exit_code, 1)
+        self.assertEqual([line.get("output") for line in lines[:3]], ["a b", None, "c"])
+        self.assertEqual([line.get("line") for line in lines[:3]], [1, 4, 5])
+        self.assertFalse(lines[1]["ok"])
+        summary = lines[3]["summary"]
+        self.assertEqual((summary["executed"], summary["failures"]), (3, 1))
+        self.assertEqual(summary["commands"]["echo"]["count"], 2)
+
+    def test_fail_fast_stops_at_first_failure(self):
+        output = io.StringIO()
+        with mock.patch("sys.stderr", new_callable=io.StringIO):
+            exit_code = self.profile.run_batch(io.StringIO("echo a\nfail\necho b\n"), output=output, fail_fast=True)
+        self.assertEqual(exit_code, 1)
+        self.assertNotIn("b", output.getvalue().splitlines())
+
+    def test_successful_batch_returns_zero(self):
+        output = io.StringIO()
+        with mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            exit_code = self.profile.run_batch(io.StringIO("ec x\nexit\necho never\n"), output=output)
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(output.getvalue(), "x\n")
+        self.assertIn("1 command(s), 0 failure(s)", stderr.getvalue())
+
+    def test_failed_setup_fails_the_batch(self):
+        def fail_setup(env_manager, check_versions=True):
+            env_manager.last_error = "npm install failed."
+            return False
+
+        output = io.StringIO()
+        with mock.patch("env_manager.EnvironmentManager.setup_environment", fail_setup), \
+                mock.patch("sys.stderr", new_callable=io.StringIO):
+            exit_code = self.profile.run_batch(io.StringIO("setup\n"), output=output, json_lines=True, fail_fast=True)
+        result = json.loads(output.getvalue().splitlines()[0])
+        self.assertEqual(exit_code, 1)
+        self.assertFalse(result["ok"])
+        self.assertIn("npm install failed.", result["error"])
+
+class TestCustomProfileLoop(unittest.TestCase):
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp()
+        with mock.patch.object(CustomProfile, "_setup_loggers"):
+            self.profile = CustomProfile(self.base_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.base_dir)
+
+    def test_end_of_input_exits_the_loop(self):
+        with mock.patch("builtins.input", side_effect=["help", EOFError()]) as prompt, \
+                mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            self.profile._main_loop()
+        self.assertEqual(prompt.call_count, 2)
+        self.assertIn("Exiting gracefully", stdout.getvalue())
+        self.assertNotIn("Error:", stdout.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,13 @@
 from logger import app_logger
 from error_manager import ErrorManager
+from clock import VirtualClock
+from fault_injection import FaultInjector
 
 app_logger.log_info("Logger is initialized.")
 
-error_manager = ErrorManager()
+# Simulated time and subprocesses: back-offs cost nothing and npm is never called
+clock = VirtualClock()
+error_manager = ErrorManager(clock=clock, runner=FaultInjector(clock))
 
 def faulty_command():
     raise ValueError('Simulated ValueError for testing.')
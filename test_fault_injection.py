@@ -0,0 +1,94 @@
+import os
+import time
+import tempfile
+import unittest
+from clock import VirtualClock
+from fault_injection import FaultInjector
+from error_manager import ErrorManager
+from env_manager import EnvironmentManager
+from logger import app_logger
+
+class FaultInjectionTestCase(unittest.TestCase):
+    def setUp(self):
+        # Recovery steps work on paths relative to the working directory
+        self.original_cwd = os.getcwd()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.temp_dir.name)
+        self.clock = VirtualClock()
+        self.injector = FaultInjector(self.clock, seed=42)
+        self.error_manager = ErrorManager(clock=self.clock, runner=self.injector)
+
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        self.temp_dir.cleanup()
+
+
+class TestRecoveryScenarios(FaultInjectionTestCase):
+    def test_network_outage_runs_in_virtual_time(self):
+        self.injector.fail_callable("fetch", ConnectionError, latency=30, times=2)
+        start = time.perf_counter()
+        self.error_manager.handle_error(self.injector.wrap("fetch"), "network_error")
+        self.assertLess(time.perf_counter() - start, 1.0)
+        # Two timed-out attempts, one 10 s network wait, then two 2 s back-offs
+        self.assertEqual(self.clock.sleeps, [10, 2, 2])
+        self.assertEqual(self.clock.now, 2 * 30 + 10 + 2 + 2)
+        self.assertEqual(self.injector.count("fetch"), 3)
+
+    def test_failed_npm_step_is_retried_on_the_next_attempt(self):
+        self.injector.fail_callable("install", times=2)
+        self.injector.fail_command(["npm", "cache", "clean"], exit_code=243, times=1, stderr="EACCES")
+        self.assertTrue(self.error_manager.recovery_loop(
+            self.injector.wrap("install"), [self.error_manager.rebuild_cache, self.error_manager.reinstall_dependencies]))
+        self.assertEqual(self.injector.count("npm cache clean --force"), 2)
+        self.assertEqual(self.injector.count("npm install"), 1)  # Succeeded on the first attempt, so it is skipped later
+        self.assertEqual(self.error_manager.recovery_step_status, {"rebuild_cache": True, "reinstall_dependencies": True})
+
+    def test_exhausted_attempts_raise(self):
+        self.injector.fail_callable("install")
+        with self.assertRaises(Exception):
+            self.error_manager.handle_error(self.injector.wrap("install"), "failed_npm_install")
+        self.assertEqual(self.clock.sleeps, [2, 2, 2])
+        self.assertEqual(self.injector.count("install"), 3)
+
+    def test_flaky_faults_are_deterministic_per_seed(self):
+        def run(seed):
+            injector = FaultInjector(seed=seed)
+            injector.fail_command(["npm", "install"], probability=0.5)
+            return [injector.run(["npm", "install"]).returncode for _ in range(20)]
+
+        self.assertEqual(run(7), run(7))
+        self.assertIn(0, run(7))
+        self.assertIn(1, run(7))
+
+    def test_recovery_steps_work_in_the_project_directory(self):
+        project_dir = os.path.join(self.temp_dir.name, "project")
+        os.makedirs(os.path.join(project_dir, "node_modules"))
+        error_manager = ErrorManager(clock=self.clock, runner=self.injector, base_dir=project_dir)
+        error_manager.create_package_json()
+        error_manager.reinstall_dependencies()
+        self.assertTrue(os.path.exists(os.path.join(project_dir, "package.json")))
+        self.assertFalse(os.path.exists(os.path.join(project_dir, "node_modules")))
+        self.assertFalse(os.path.exists("package.json"))  # The working directory is left alone
+
+
+class TestEnvironmentFaults(FaultInjectionTestCase):
+    def test_version_checks_use_the_injected_runner(self):
+        env_manager = EnvironmentManager(self.temp_dir.name, app_logger, self.error_manager)
+        self.injector.set_output(["node", "-v"], "v20.0.0", latency=0.5)
+        self.injector.fail_command(["npm", "-v"], exit_code=127, latency=1.5)
+        with self.assertRaises(Exception) as context:
+            env_manager._check_versions()
+        self.assertEqual(str(context.exception), "npm not found.")
+        self.assertEqual(self.clock.now, 2.0)
+        self.assertEqual(self.injector.count("python3 --version"), 0)
+
+    def test_hung_command_times_out(self):
+        env_manager = EnvironmentManager(self.temp_dir.name, app_logger, self.error_manager)
+        self.injector.fail_command(["node", "-v"], exit_code=0, latency=3600)
+        with self.assertRaises(Exception) as context:
+            env_manager._check_versions()
+        self.assertEqual(str(context.exception), "Node.js not found.")
+        self.assertEqual(self.clock.now, 30)  # Killed at the version check timeout, not after an hour
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+from fault_injection import FaultInjector
+from fleet import resolve_projects, run_fleet, format_report
+
+class TestFleet(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        for name in ("alpha", "beta", "broken"):
+            os.makedirs(os.path.join(self.root, "projects", name))
+        # A file where the logs directory should be makes the project fail
+        with open(os.path.join(self.root, "projects", "broken", "logs"), "w") as f:
+            f.write("not a directory")
+        with open(os.path.join(self.root, "projects", "alpha", "package.json"), "w") as f:
+            json.dump({"name": "alpha"}, f)
+        os.makedirs(os.path.join(self.root, "projects", "alpha", "node_modules"))
+        self.runner = FaultInjector()
+        self.runner.set_output(["node", "-v"], "v20.0.0")
+        self.runner.fail_command(["npm", "-v"], exit_code=127)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_resolve_projects(self):
+        pattern = os.path.join(self.root, "projects", "*")
+        self.assertEqual([os.path.basename(path) for path in resolve_projects([pattern, pattern])], ["alpha", "beta", "broken"])
+        self.assertEqual([os.path.basename(path) for path in resolve_projects([pattern], marker="package.json")], ["alpha"])
+
+    def test_projects_run_in_parallel_with_their_own_log_and_state(self):
+        roots = resolve_projects([os.path.join(self.root, "projects", "*")])
+        report = run_fleet(roots, workers=2, runner=self.runner)
+
+        # Toolchain probes ran once in the parent; npm is missing, so the cache warm-up was skipped
+        self.assertEqual(report["toolchain"], {"node": "v20.0.0", "npm": None, "python": ""})
+        self.assertEqual(self.runner.count("node -v"), 1)
+        self.assertIsNone(report["npm_cache_warmed"])
+
+        projects = {os.path.basename(project["root"]): project for project in report["projects"]}
+        self.assertTrue(projects["alpha"]["ok"], projects["alpha"])
+        self.assertTrue(projects["beta"]["ok"], projects["beta"])
+        self.assertFalse(projects["broken"]["ok"])
+        self.assertIsNotNone(projects["broken"]["error"])
+        self.assertEqual(report["summary"]["failed_projects"], [projects["broken"]["root"]])
+
+        for name in ("alpha", "beta"):
+            project_dir = os.path.join(self.root, "projects", name)
+            with open(os.path.join(project_dir, "logs", "system_state.json")) as f:
+                state = json.load(f)
+            self.assertTrue(state["initialized"])
+            self.assertEqual(state["toolchain"]["node"], "v20.0.0")
+            with open(os.path.join(project_dir, "logs", "log_output.log")) as f:
+                log = f.read()
+            self.assertIn(f"Fleet run started for {project_dir}", log)
+            self.assertNotIn("Fleet run started for", log.replace(f"Fleet run started for {project_dir}", ""))
+            self.assertIsNotNone(projects[name]["health_seconds"])
+        self.assertIn("FAIL", format_report(report))
+
+    @unittest.skipUnless(os.name == "posix", "Uses a shell script as a stand-in npm")
+    def test_failed_npm_install_is_reported(self):
+        project_dir = os.path.join(self.root, "needs-install")
+        os.makedirs(project_dir)
+        with open(os.path.join(project_dir, "package.json"), "w") as f:
+            json.dump({"name": "needs-install"}, f)
+        bin_dir = os.path.join(self.root, "bin")
+        os.makedirs(bin_dir)
+        npm = os.path.join(bin_dir, "npm")
+        with open(npm, "w") as f:
+            f.write("#!/bin/sh\necho 'npm ERR! registry unreachable' >&2\nexit 1\n")
+        os.chmod(npm, 0o755)
+
+        with mock.patch.dict(os.environ, {"PATH": bin_dir + os.pathsep + os.environ.get("PATH", "")}):
+            report = run_fleet([project_dir], workers=1, health=False, runner=self.runner)
+
+        project = report["projects"][0]
+        self.assertFalse(project["ok"])
+        self.assertIn("npm install failed", project["error"])
+        self.assertNotIn("No recovery steps", project["error"])
+        self.assertIsNotNone(project["setup_seconds"])
+        self.assertFalse(os.path.exists(os.path.join(project_dir, "node_modules")))
+        with open(os.path.join(project_dir, "logs", "log_output.log")) as f:
+            self.assertIn("npm ERR! registry unreachable", f.read())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import os
+import json
+import hashlib
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from health_check import HealthCheck
+
+class TestHealthCheckCache(unittest.TestCase):
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp()
+        for directory in ["logs", "configs", "scripts"]:
+            os.makedirs(os.path.join(self.base_dir, directory))
+        files = {
+            "package.json": '{"name": "project", "version": "1.0.0"}',
+            os.path.join("logs", "system_state.json"): "{}",
+            os.path.join("logs", "log_output.log"): "",
+            os.path.join("configs", "config.txt"): "Default configuration",
+            os.path.join("scripts", "setup.sh"): "#!/bin/bash\n"
+        }
+        for name, content in files.items():
+            path = os.path.join(self.base_dir, name)
+            with open(path, 'w') as f:
+                f.write(content)
+            os.chmod(path, 0o644)
+        os.chmod(os.path.join(self.base_dir, "scripts", "setup.sh"), 0o755)
+
+    def tearDown(self):
+        shutil.rmtree(self.base_dir)
+
+    def test_unchanged_files_skip_validation(self):
+        HealthCheck(self.base_dir).run_health_check()
+
+        health_check = HealthCheck(self.base_dir)
+        with mock.patch.object(health_check, "validate_file") as validate_file, \
+                mock.patch.object(health_check, "check_permissions") as check_permissions:
+            results = health_check.run_health_check()
+        validate_file.assert_not_called()
+        check_permissions.assert_not_called()
+        self.assertTrue(all(result["valid"] for result in results.values()))
+
+    def test_changed_file_is_revalidated(self):
+        HealthCheck(self.base_dir).run_health_check()
+        package_json = os.path.join(self.base_dir, "package.json")
+        with open(package_json, 'w') as f:
+            json.dump({"name": "project", "version": "1.0.1"}, f)
+        os.chmod(package_json, 0o644)
+
+        health_check = HealthCheck(self.base_dir)
+        with mock.patch.object(health_check, "validate_file", wraps=health_check.validate_file) as validate_file:
+            health_check.run_health_check()
+        self.assertEqual([call.args[0] for call in validate_file.call_args_list], [package_json])
+
+    def test_force_revalidates_every_file(self):
+        HealthCheck(self.base_dir).run_health_check()
+
+        health_check = HealthCheck(self.base_dir)
+        with mock.patch.object(health_check, "validate_file", wraps=health_check.validate_file) as validate_file:
+            health_check.run_health_check(force=True)
+        self.assertEqual(validate_file.call_count, len(health_check.files_to_check))
+
+class TestHealthCheckManifest(unittest.TestCase):
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.base_dir, "configs", "projects"))
+        os.makedirs(os.path.join(self.base_dir, "state"))
+        self.manifest = {
+            "max_workers": 4,
+            "files": [
+                {"pattern": "state/*.json", "validator": "json",
+                 "recovery_steps": ["restore_from_backup", "initialize_system_state"], "permissions": "644"},
+                {"pattern": "configs/**/*.txt", "validator": "text", "permissions": "600"}
+            ]
+        }
+        with open(os.path.join(self.base_dir, "configs", "health_check.json"), 'w') as f:
+            json.dump(self.manifest, f)
+        for i in range(20):
+            self._write(os.path.join("state", f"state_{i:02d}.json"), json.dumps({"index": i}))
+        self._write(os.path.join("configs", "projects", "a.txt"), "a")
+
+    def tearDown(self):
+        shutil.rmtree(self.base_dir)
+
+    def _write(self, name, content, mode=0o644):
+        path = os.path.join(self.base_dir, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        os.chmod(path, mode)
+        return path
+
+    def test_globs_expand_in_deterministic_order(self):
+        health_check = HealthCheck(self.base_dir)
+        self.assertEqual(health_check.max_workers, 4)
+        results = health_check.run_health_check()
+        expected = [os.path.join("state", f"state_{i:02d}.json") for i in range(20)]
+        expected.append(os.path.join("configs", "projects", "a.txt"))
+        self.assertEqual(list(results), expected)
+        self.assertTrue(all(result["valid"] for result in results.values()))
+        # Per-pattern permissions are applied
+        mode = os.stat(os.path.join(self.base_dir, "configs", "projects", "a.txt")).st_mode
+        self.assertEqual(oct(mode)[-3:], "600")
+
+    def test_recovery_runs_only_for_failed_files_batched_per_step(self):
+        broken = [self._write(os.path.join("state", f"state_{i:02d}.json"), "{broken") for i in (3, 7)]
+        self._write(os.path.join("state", "state_07.json.backup"), "{}")
+
+        health_check = HealthCheck(self.base_dir)
+        calls = []
+        original_restore = health_check.restore_from_backup
+        original_initialize = health_check.initialize_system_state
+        health_check.restore_from_backup = lambda paths: (calls.append(("restore", list(paths))), original_restore(paths))
+        health_check.initialize_system_state = lambda paths: (calls.append(("initialize", list(paths))), original_initialize(paths))
+        results = health_check.run_health_check()
+
+        self.assertEqual(calls, [("restore", broken), ("initialize", broken[:1])])
+        self.assertTrue(all(result["valid"] for result in results.values()))
+
+    def test_checksum_mismatch_fails_validation(self):
+        path = os.path.join(self.base_dir, "state", "state_00.json")
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        self.manifest["checksums_file"] = "configs/checksums.json"
+        self._write(os.path.join("configs", "health_check.json"), json.dumps(self.manifest))
+        self._write(os.path.join("configs", "checksums.json"), json.dumps({
+            os.path.join("state", "state_00.json"): digest,
+            os.path.join("state", "state_01.json"): hashlib.sha256(b"other").hexdigest()
+        }))
+
+        health_check = HealthCheck(self.base_dir)
+        self.assertTrue(health_check._validate_entry(health_check.files_to_check[os.path.join("state", "state_00.json")]))
+        self.assertFalse(health_check._validate_entry(health_check.files_to_check[os.path.join("state", "state_01.json")]))
+
+    def test_invalid_manifest_falls_back_to_defaults(self):
+        self._write(os.path.join("configs", "health_check.json"), "{not json")
+        health_check = HealthCheck(self.base_dir)
+        self.assertIn("package.json", health_check.files_to_check)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from health_check import HealthCheck
+from health_server import HealthMonitor, create_app
+from metrics import Metrics
+from state_manager import StateManager
+
+class TestHealthServer(unittest.TestCase):
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.base_dir, "configs"))
+        with open(os.path.join(self.base_dir, "configs", "health_check.json"), 'w') as f:
+            json.dump({"files": [{"pattern": "package.json", "recovery_steps": []}]}, f)
+        self.package_json = os.path.join(self.base_dir, "package.json")
+        with open(self.package_json, 'w') as f:
+            f.write('{"name": "project"}')
+        os.chmod(self.package_json, 0o644)
+        self.state_manager = StateManager(os.path.join(self.base_dir, "logs", "system_state.json"))
+        self.health_check = HealthCheck(self.base_dir)
+        self.monitor = HealthMonitor(self.health_check, self.state_manager, interval=3600)
+        self.client = create_app(self.monitor).test_client()
+
+    def tearDown(self):
+        self.monitor.stop()
+        shutil.rmtree(self.base_dir)
+
+    def test_healthz_serves_cached_result_without_rerunning_checks(self):
+        self.assertEqual(self.client.get("/healthz").status_code, 503)  # Nothing computed yet
+        self.monitor.start()
+        with mock.patch.object(self.health_check, "run_health_check") as run_health_check:
+            for _ in range(5):
+                response = self.client.get("/healthz")
+                self.assertEqual(response.status_code, 200)
+        run_health_check.assert_not_called()
+        self.assertEqual(response.get_json()["files"]["package.json"]["valid"], True)
+
+    def test_healthz_reports_failures_after_refresh(self):
+        with open(self.package_json, 'w') as f:
+            f.write("{broken")
+        self.monitor.refresh()
+        response = self.client.get("/healthz")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.get_json()["status"], "failing")
+
+    def test_refresh_reports_failures_without_changing_files(self):
+        with open(os.path.join(self.base_dir, "configs", "health_check.json"), 'w') as f:
+            json.dump({"files": [
+                {"pattern": "package.json", "recovery_steps": ["restore_package_json", "create_package_json"]},
+                {"pattern": "configs/app.json", "permissions": "644"}
+            ]}, f)
+        config = os.path.join(self.base_dir, "configs", "app.json")
+        with open(config, 'w') as f:
+            f.write("{}")
+        os.chmod(config, 0o600)
+        with open(self.package_json, 'w') as f:
+            f.write("{broken")
+        monitor = HealthMonitor(HealthCheck(self.base_dir), self.state_manager, interval=3600)
+        monitor.refresh()
+
+        status, body = monitor.health
+        files = json.loads(body)["files"]
+        self.assertEqual(status, 503)
+        self.assertFalse(files["package.json"]["valid"])
+        self.assertFalse(files[os.path.join("configs", "app.json")]["permissions_ok"])
+        with open(self.package_json) as f:
+            self.assertEqual(f.read(), "{broken")
+        self.assertEqual(oct(os.stat(config).st_mode)[-3:], "600")
+
+    def test_readyz_follows_initialized_state(self):
+        self.monitor.refresh()
+        self.assertEqual(self.client.get("/readyz").status_code, 503)
+        self.state_manager.update_state("initialized", True)
+        self.monitor.refresh()
+        response = self.client.get("/readyz")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {"ready": True})
+
+    def test_unreadable_state_is_reported_not_ready(self):
+        self.state_manager.update_state("initialized", True)
+        self.monitor.refresh()
+        with mock.patch.object(self.state_manager, "load_state", side_effect=PermissionError("denied")):
+            self.monitor.refresh()
+        response = self.client.get("/readyz")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.get_json(), {"ready": False, "error": "denied"})
+        self.assertEqual(self.client.get("/healthz").status_code, 200)
+
+    def test_metrics_are_exposed_in_prometheus_format(self):
+        self.monitor.refresh()
+        self.state_manager.update_state("initialized", True)
+        body = self.client.get("/metrics").get_data(as_text=True)
+        self.assertIn("# TYPE health_check_seconds histogram", body)
+        self.assertIn("# TYPE state_save_seconds histogram", body)
+        self.assertIn('log_messages_total{level="info"}', body)
+
+class TestMetrics(unittest.TestCase):
+    def test_render_prometheus(self):
+        metrics = Metrics()
+        metrics.inc("recovery_steps_total", step="create_package_json", outcome="success")
+        metrics.inc("recovery_steps_total", step="create_package_json", outcome="success")
+        metrics.observe("recovery_step_seconds", 0.002, step="create_package_json")
+        body = metrics.render_prometheus()
+        self.assertIn('recovery_steps_total{outcome="success",step="create_package_json"} 2', body)
+        self.assertIn('recovery_step_seconds_bucket{step="create_package_json",le="0.001"} 0', body)
+        self.assertIn('recovery_step_seconds_bucket{step="create_package_json",le="0.005"} 1', body)
+        self.assertIn('recovery_step_seconds_count{step="create_package_json"} 1', body)
+        self.assertEqual(metrics.get("recovery_step_seconds", step="create_package_json"), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import json
+import time
+import shutil
+import tempfile
+import unittest
+from health_check import HealthCheck
+from health_watch import HealthWatcher
+
+class TestHealthWatcher(unittest.TestCase):
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.base_dir, "state"))
+        os.makedirs(os.path.join(self.base_dir, "configs"))
+        with open(os.path.join(self.base_dir, "configs", "health_check.json"), 'w') as f:
+            json.dump({"files": [{"pattern": "state/*.json", "recovery_steps": ["initialize_system_state"]}]}, f)
+        for i in range(3):
+            self._write(f"state_{i}.json", "{}")
+
+    def tearDown(self):
+        shutil.rmtree(self.base_dir)
+
+    def _write(self, name, content):
+        path = os.path.join(self.base_dir, "state", name)
+        with open(path, 'w') as f:
+            f.write(content)
+        os.chmod(path, 0o644)
+        return path
+
+    def _wait_for(self, condition, timeout=5):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if condition():
+                return True
+            time.sleep(0.02)
+        return False
+
+    def _read(self, path):
+        with open(path, 'r') as f:
+            return f.read()
+
+    def _assert_recovers_corrupted_file(self, watcher):
+        watcher.start()
+        try:
+            self.assertTrue(watcher.ready.wait(5))
+            path = self._write("state_1.json", "{broken")
+            self.assertTrue(self._wait_for(lambda: self._read(path).strip() == "{}"))
+            # A new file matching a glob is picked up and validated too
+            new_path = self._write("state_9.json", "{broken")
+            self.assertTrue(self._wait_for(lambda: self._read(new_path).strip() == "{}"))
+        finally:
+            watcher.stop()
+
+    def test_inotify_revalidates_changed_file(self):
+        watcher = HealthWatcher(HealthCheck(self.base_dir), debounce=0.05)
+        self._assert_recovers_corrupted_file(watcher)
+
+    def test_polling_fallback_revalidates_changed_file(self):
+        watcher = HealthWatcher(HealthCheck(self.base_dir), poll_interval=0.05, use_inotify=False)
+        self._assert_recovers_corrupted_file(watcher)
+
+    def test_burst_of_writes_is_debounced(self):
+        watcher = HealthWatcher(HealthCheck(self.base_dir), debounce=0.3)
+        watcher.start()
+        try:
+            self.assertTrue(watcher.ready.wait(5))
+            for i in range(20):
+                self._write("state_0.json", json.dumps({"write": i}))
+            self.assertTrue(self._wait_for(lambda: watcher.checks_run >= 1))
+            time.sleep(0.5)
+            self.assertEqual(watcher.checks_run, 1)
+        finally:
+            watcher.stop()
+
+    def _assert_continuous_writes_are_revalidated(self, watcher):
+        watcher.start()
+        try:
+            self.assertTrue(watcher.ready.wait(5))
+            # Writes arrive faster than the debounce for twice the max wait
+            deadline = time.monotonic() + 2 * watcher.max_wait
+            i = 0
+            while time.monotonic() < deadline:
+                self._write("state_0.json", json.dumps({"write": i}))
+                i += 1
+                time.sleep(0.02)
+            self.assertGreaterEqual(watcher.checks_run, 1)
+        finally:
+            watcher.stop()
+
+    def test_continuous_writes_are_revalidated_within_max_wait(self):
+        self._assert_continuous_writes_are_revalidated(HealthWatcher(HealthCheck(self.base_dir), debounce=0.3, max_wait=0.5))
+
+    def test_polling_continuous_writes_are_revalidated_within_max_wait(self):
+        self._assert_continuous_writes_are_revalidated(
+            HealthWatcher(HealthCheck(self.base_dir), poll_interval=0.05, use_inotify=False, max_wait=0.5))
+
+    def test_stop_releases_the_wake_pipe(self):
+        unstarted = HealthWatcher(HealthCheck(self.base_dir))
+        unstarted.stop()
+        self.assertFalse(unstarted._pipe_open)
+
+        watcher = HealthWatcher(HealthCheck(self.base_dir), debounce=0.05)
+        watcher.start()
+        self.assertTrue(watcher.ready.wait(5))
+        watcher.stop()
+        self.assertFalse(watcher._pipe_open)
+        watcher.stop()  # Stopping again must not write to the closed descriptor
+
+if __name__ == '__main__':
+    unittest.main()
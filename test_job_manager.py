@@ -0,0 +1,135 @@
+import os
+import sys
+import shutil
+import tempfile
+import time
+import threading
+import unittest
+from loguru import logger
+from job_manager import JobManager
+from logger import Logger
+from process_runner import ProcessRunner
+
+class TestJobManager(unittest.TestCase):
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp()
+        self.release = threading.Event()
+        self.running = []
+        self.max_running = 0
+        self.guard = threading.Lock()
+
+        def runner(command):
+            with self.guard:
+                self.running.append(command)
+                self.max_running = max(self.max_running, len(self.running))
+            try:
+                logger.info(f"working on {command}")
+                if command.startswith("block"):
+                    self.release.wait(5)
+                if command == "fail":
+                    raise RuntimeError("boom")
+                return f"result of {command}"
+            finally:
+                with self.guard:
+                    self.running.remove(command)
+
+        locks = {"block npm": ["npm"], "npm": ["npm"]}
+        self.jobs = JobManager(runner, self.log_dir, max_workers=4, locks_for=lambda command: locks.get(command, []))
+
+    def tearDown(self):
+        self.release.set()
+        self.jobs.shutdown()
+        shutil.rmtree(self.log_dir)
+
+    def test_submit_returns_immediately_and_output_is_logged_per_job(self):
+        blocked = self.jobs.submit("block other")
+        self.assertIn(blocked.status, ("queued", "running"))
+        done = self.jobs.wait(self.jobs.submit("quick").id, timeout=5)
+        self.assertEqual((done.status, done.result), ("done", "result of quick"))
+        log = self.jobs.output(done.id)
+        self.assertIn("working on quick", log)
+        self.assertNotIn("working on block other", log)
+        self.release.set()
+        self.assertEqual(self.jobs.wait(blocked.id, timeout=5).status, "done")
+
+    def test_conflicting_jobs_never_overlap(self):
+        first = self.jobs.submit("block npm")
+        second = self.jobs.submit("npm")
+        self.jobs.wait(second.id, timeout=0.3)
+        self.assertEqual(second.status, "waiting")
+        self.release.set()
+        self.assertEqual(self.jobs.wait(second.id, timeout=5).status, "done")
+        self.assertEqual(first.status, "done")
+        self.assertEqual(self.max_running, 1)
+
+    def test_cancel_waiting_job_and_failed_job_status(self):
+        self.jobs.submit("block npm")
+        waiting = self.jobs.submit("npm")
+        self.jobs.wait(waiting.id, timeout=0.2)
+        self.assertTrue(self.jobs.cancel(waiting.id))
+        self.assertEqual(waiting.status, "cancelled")
+        failed = self.jobs.wait(self.jobs.submit("fail").id, timeout=5)
+        self.assertEqual((failed.status, failed.error), ("failed", "boom"))
+        with self.assertRaises(ValueError):
+            self.jobs.get(999)
+
+    def test_foreground_command_waits_for_background_lock(self):
+        self.jobs.submit("block npm")
+        while "block npm" not in self.running:
+            threading.Event().wait(0.01)
+        finished = threading.Event()
+
+        def foreground():
+            with self.jobs.locked("npm"):
+                finished.set()
+
+        thread = threading.Thread(target=foreground)
+        thread.start()
+        self.assertFalse(finished.wait(0.3))
+        self.release.set()
+        self.assertTrue(finished.wait(5))
+        thread.join()
+
+    def test_job_can_take_its_own_locks(self):
+        jobs = JobManager(lambda command: self._locked_run(jobs, command), self.log_dir, locks_for=lambda command: ["npm"])
+        try:
+            self.assertEqual(jobs.wait(jobs.submit("npm").id, timeout=5).status, "done")
+        finally:
+            jobs.shutdown()
+
+    def _locked_run(self, jobs, command):
+        with jobs.locked(command):
+            return command
+
+    def test_subprocess_output_reaches_the_job_log(self):
+        runner = ProcessRunner(default_timeout=10, logger=Logger(os.path.join(self.log_dir, "app.log")))
+        jobs = JobManager(lambda command: runner.run([sys.executable, "-c", f"print('{command} says hello')"]).returncode, self.log_dir)
+        try:
+            job = jobs.wait(jobs.submit("child").id, timeout=10)
+            self.assertEqual(job.status, "done")
+            self.assertIn("child says hello", jobs.output(job.id))
+        finally:
+            jobs.shutdown()
+
+    def test_cancel_kills_the_command_of_a_running_job(self):
+        runner = ProcessRunner(default_timeout=60, logger=Logger(os.path.join(self.log_dir, "app.log")))
+        started = threading.Event()
+
+        def run(command):
+            started.set()
+            return runner.run([sys.executable, "-c", "import time; time.sleep(60)"])
+
+        jobs = JobManager(run, self.log_dir)
+        try:
+            job = jobs.submit("sleep")
+            self.assertTrue(started.wait(5))
+            start = time.monotonic()
+            self.assertTrue(jobs.cancel(job.id))
+            self.assertLess(time.monotonic() - start, 10)
+            self.assertEqual(job.status, "cancelled")
+            self.assertFalse(jobs.cancel(job.id))
+        finally:
+            jobs.shutdown()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import sys
+import time
+import threading
+import subprocess
+import unittest
+from unittest import mock
+from process_runner import ProcessRunner, command_label
+from metrics import app_metrics
+
+def python(code):
+    return [sys.executable, "-c", code]
+
+class TestProcessRunner(unittest.TestCase):
+    def setUp(self):
+        self.logger = mock.Mock()
+        self.runner = ProcessRunner(default_timeout=10, max_concurrent=1, logger=self.logger)
+
+    def test_output_is_streamed_to_the_logger(self):
+        result = self.runner.run(python("import sys; print('out 1'); print('out 2'); print('err', file=sys.stderr)"))
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stdout, "out 1\nout 2")
+        self.assertEqual(result.stderr, "err")
+        label = command_label(python(""))
+        self.logger.log_info.assert_any_call(f"{label}: out 2", context="ProcessRunner")
+        self.logger.log_warning.assert_any_call(f"{label}: err", context="ProcessRunner")
+
+    def test_check_raises_and_exit_codes_are_counted(self):
+        label = command_label(python(""))
+        before = app_metrics.get("subprocess_runs_total", command=label, exit_code="3")
+        with self.assertRaises(subprocess.CalledProcessError) as context:
+            self.runner.run(python("raise SystemExit(3)"), check=True)
+        self.assertEqual(context.exception.returncode, 3)
+        self.assertEqual(app_metrics.get("subprocess_runs_total", command=label, exit_code="3"), before + 1)
+
+    @unittest.skipUnless(hasattr(os, "killpg"), "Process groups are POSIX only")
+    def test_timeout_kills_the_process_group(self):
+        # The command starts a grandchild that would outlive a plain kill of the child
+        code = ("import subprocess, sys, time; "
+                "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)']); "
+                "print(child.pid, flush=True); time.sleep(60)")
+        start = time.perf_counter()
+        with self.assertRaises(subprocess.TimeoutExpired) as context:
+            self.runner.run(python(code), timeout=0.5)
+        self.assertLess(time.perf_counter() - start, 5)
+        grandchild = int(context.exception.output.strip())
+        deadline = time.time() + 2
+        while time.time() < deadline and _alive(grandchild):
+            time.sleep(0.05)
+        self.assertFalse(_alive(grandchild))
+
+    def test_semaphore_limits_concurrency(self):
+        threads = [threading.Thread(target=self.runner.run, args=(python("import time; time.sleep(0.3)"),)) for _ in range(2)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertGreaterEqual(time.perf_counter() - start, 0.6)
+
+    def test_command_label(self):
+        self.assertEqual(command_label(["npm", "install"]), "npm install")
+        self.assertEqual(command_label(["/usr/bin/node", "-v"]), "node")
+        self.assertEqual(command_label(["chmod", "u+rw", "package.json"]), "chmod")
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # A killed grandchild is reparented to init and may linger as a zombie until reaped
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().split()[2] != "Z"
+    except OSError:
+        return True
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from result_cache import ResultCache, file_fingerprint
+from repl_history import CommandHistory
+from custom_profile import CustomProfile
+
+class TestResultCache(unittest.TestCase):
+    def test_lru_eviction_and_hit_rate(self):
+        cache = ResultCache(max_entries=2, ttl=60)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.lookup("a"), (True, 1))  # "b" is now least recently used
+        cache.put("c", 3)
+        self.assertEqual(cache.lookup("b"), (False, None))
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"], stats["entries"]), (1, 1, 1, 2))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_expired_entries_miss(self):
+        cache = ResultCache(ttl=10)
+        with mock.patch("result_cache.time.monotonic", return_value=100.0):
+            cache.put("a", None)
+            self.assertEqual(cache.lookup("a"), (True, None))
+        with mock.patch("result_cache.time.monotonic", return_value=111.0):
+            self.assertEqual(cache.lookup("a"), (False, None))
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_fingerprint_changes_with_input(self):
+        with tempfile.TemporaryDirectory() as base_dir:
+            before = file_fingerprint(base_dir, ["state.json"])
+            with open(os.path.join(base_dir, "state.json"), "w") as f:
+                f.write("{}")
+            self.assertNotEqual(file_fingerprint(base_dir, ["state.json"]), before)
+
+
+class TestCommandHistory(unittest.TestCase):
+    def test_persists_and_compacts(self):
+        with tempfile.TemporaryDirectory() as base_dir:
+            path = os.path.join(base_dir, "logs", "repl_history")
+            history = CommandHistory(path, max_entries=3)
+            for command in ["a", "a", "", "b", "c", "d", "e", "f", "g"]:
+                history.append(command)
+            with open(path) as f:
+                self.assertEqual(f.read().split(), ["e", "f", "g"])  # Compacted after 7 lines
+            self.assertEqual(CommandHistory(path, max_entries=3).recent(), ["e", "f", "g"])
+
+
+class TestIdempotentCommands(unittest.TestCase):
+    def test_results_reused_until_inputs_change(self):
+        with tempfile.TemporaryDirectory() as base_dir:
+            with mock.patch.object(CustomProfile, "_setup_loggers"):
+                profile = CustomProfile(base_dir)
+            calls = []
+            profile.registry.register("count", handler=lambda profile, *args: calls.append(args) or len(calls),
+                                      idempotent=True, inputs=["input.txt"])
+            self.assertEqual(profile.execute("count x"), 1)
+            self.assertEqual(profile.execute("count x"), 1)
+            self.assertEqual(profile.execute("count y"), 2)
+            with open(os.path.join(base_dir, "input.txt"), "w") as f:
+                f.write("changed")
+            self.assertEqual(profile.execute("count x"), 3)
+            self.assertIn("1 hit(s)", profile.execute("cache"))
+            profile.jobs.shutdown()
+
+if __name__ == '__main__':
+    unittest.main()
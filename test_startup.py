@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+import tempfile
+import subprocess
+import unittest
+from startup_profile import StartupProfiler, parse_importtime
+from state_manager import StateManager
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MAIN = os.path.join(BASE_DIR, "main.py")
+
+# Subsystems a batch run of a cheap command must not import. Importing them is what made startup slow,
+# so checking for them catches that regression without a timing budget that flakes on loaded machines.
+DEFERRED_MODULES = {"flask", "health_server", "health_check", "env_manager", "error_manager", "fleet", "benchmarks", "readline"}
+
+class TestStartupProfiler(unittest.TestCase):
+    def test_phases_are_recorded_only_when_enabled(self):
+        profiler = StartupProfiler()
+        with profiler.phase("imports"):
+            pass
+        self.assertEqual(profiler.phases, {})
+
+        profiler.enabled = True
+        for _ in range(2):
+            with profiler.phase("imports"):
+                time.sleep(0.01)
+        self.assertEqual(list(profiler.phases), ["imports"])
+        self.assertGreaterEqual(profiler.phases["imports"], 0.02)
+        self.assertIn("imports", profiler.report())
+
+    def test_parse_importtime(self):
+        output = ("import time: self [us] | cumulative | imported package\n"
+                  "import time:       100 |        100 |   json.decoder\n"
+                  "import time:       250 |        350 | json\n")
+        self.assertEqual(parse_importtime(output), [("json.decoder", 100, 100), ("json", 250, 350)])
+
+
+class TestStartupBudget(unittest.TestCase):
+    def test_importing_main_defers_subsystems(self):
+        result = subprocess.run([sys.executable, "-c", "import sys, main; print(sorted({'custom_profile', 'loguru', 'readline'} & set(sys.modules)))"],
+                                cwd=BASE_DIR, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "[]")
+
+    def test_state_manager_touches_disk_only_on_save(self):
+        with tempfile.TemporaryDirectory() as base_dir:
+            state_file = os.path.join(base_dir, "logs", "system_state.json")
+            state_manager = StateManager(state_file)
+            self.assertFalse(os.path.exists(os.path.dirname(state_file)))
+            state_manager.update_state("initialized", True)
+            self.assertTrue(os.path.exists(state_file))
+
+    def test_batch_command_leaves_subsystems_unimported(self):
+        with tempfile.TemporaryDirectory() as cwd:
+            result = subprocess.run([sys.executable, "-X", "importtime", MAIN, "--batch", "-"], input="help\n", cwd=cwd,
+                                    capture_output=True, text=True, check=True, timeout=30)
+        imported = {module.split(".")[0] for module, _, _ in parse_importtime(result.stderr)}
+        self.assertIn("custom_profile", imported)
+        self.assertEqual(imported & DEFERRED_MODULES, set())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import json
+import hashlib
+import tempfile
+import unittest
+from stream_validators import JsonSyntaxChecker, validate_stream
+
+DOCUMENTS = [
+    '{}', '[]', '', ' ', '{"a":1,}', '[1,]', '{"a" 1}', '[1 2]', '"\\x"', '"\\u12g4"', '-', '01', '1.',
+    '1e5', 'NaN', '-Infinity', 'tru', '{"a":[1,{"b":null}]}', '[', '"abc', '{"a":1}}', '{,}', '[,1]',
+    '{"a":1 "b":2}', '"\t"', '"\\ud83d"', '[-0.5e-3]', '{"a":-}', '1 2', 'true false', '{"":""}',
+    '{1:2}', '[]]', '"a\\"b"', '["\\\\", "\\u00e9x"]', '"\\\\"x', '{"k": "café", "n": [1.5, -2, 3e10]}'
+]
+
+class TestJsonSyntaxChecker(unittest.TestCase):
+    def test_matches_json_module_for_any_chunk_size(self):
+        for document in DOCUMENTS:
+            try:
+                json.loads(document)
+                expected = True
+            except ValueError:
+                expected = False
+            for size in (1, 2, 3, 7, 100):
+                checker = JsonSyntaxChecker()
+                try:
+                    for i in range(0, len(document), size):
+                        checker.feed(document[i:i + size])
+                    checker.close()
+                    valid = True
+                except ValueError:
+                    valid = False
+                self.assertEqual(valid, expected, f"{document!r} in chunks of {size}")
+
+class TestValidateStream(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def _write(self, content):
+        with open(self.path, 'wb') as f:
+            f.write(content)
+
+    def test_large_json_is_checked_in_chunks(self):
+        document = {f"key_{i}": {"value": i, "items": [True, None, "x" * 10]} for i in range(2000)}
+        self._write(json.dumps(document).encode())
+        self.assertEqual(validate_stream(self.path, "json", chunk_size=512), os.path.getsize(self.path))
+        self._write(json.dumps(document).encode()[:-1])
+        with self.assertRaises(ValueError):
+            validate_stream(self.path, "json", chunk_size=512)
+
+    def test_text_encoding_errors_are_detected_across_chunks(self):
+        self._write("café ".encode() * 100)
+        validate_stream(self.path, "text", chunk_size=3)
+        self._write(b"valid text" + b"\xff")
+        with self.assertRaises(ValueError):
+            validate_stream(self.path, "text", chunk_size=4)
+
+    def test_max_bytes_limits_inspection(self):
+        self._write(b'{"a": [' + b'1, ' * 1000 + b'{broken')
+        self.assertEqual(validate_stream(self.path, "json", chunk_size=64, max_bytes=100), 100)
+        with self.assertRaises(ValueError):
+            validate_stream(self.path, "json", chunk_size=64)
+
+    def test_reading_stops_at_max_bytes_with_a_hasher(self):
+        self._write(b'"' + b"x" * 1024 * 1024 + b'"')
+
+        class CountingHasher:
+            hashed = 0
+
+            def update(self, data):
+                self.hashed += len(data)
+
+        hasher = CountingHasher()
+        self.assertEqual(validate_stream(self.path, "json", chunk_size=4096, max_bytes=10000, hasher=hasher), 10000)
+        self.assertLessEqual(hasher.hashed, 10000 + 4096)
+
+    def test_checksum_is_verified(self):
+        content = b"#!/bin/bash\necho hello\n" * 50
+        self._write(content)
+        digest = hashlib.sha256(content).hexdigest()
+        validate_stream(self.path, "text", chunk_size=16, max_bytes=10, expected_sha256=digest)
+        validate_stream(self.path, "exists", expected_sha256=digest.upper())
+        with self.assertRaises(ValueError):
+            validate_stream(self.path, "text", expected_sha256=hashlib.sha256(b"other").hexdigest())
+
+if __name__ == '__main__':
+    unittest.main()
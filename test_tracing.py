@@ -0,0 +1,63 @@
+import os
+import json
+import tempfile
+import unittest
+from tracing import Tracer
+
+class TestTracer(unittest.TestCase):
+    def setUp(self):
+        self.tracer = Tracer()
+
+    def test_disabled_tracer_records_nothing(self):
+        traced = self.tracer.traced()(lambda x: x * 2)
+        with self.tracer.span("block", path="a"):
+            pass
+        self.assertEqual(traced(2), 4)
+        self.assertEqual(self.tracer.spans(), [])
+
+    def test_spans_and_decorator_are_recorded(self):
+        self.tracer.enable()
+
+        @self.tracer.traced("double")
+        def double(x):
+            return x * 2
+
+        with self.tracer.span("outer", path="a.json"):
+            self.assertEqual(double(3), 6)
+        with self.assertRaises(ValueError):
+            with self.tracer.span("failing"):
+                raise ValueError("boom")
+        names = [span[0] for span in self.tracer.spans()]
+        self.assertEqual(names, ["double", "outer", "failing"])
+        self.assertEqual(self.tracer.spans()[2][4], {"error": "ValueError"})
+
+    def test_chrome_trace_export(self):
+        self.tracer.enable()
+        with self.tracer.span("outer", command=["npm", "-v"]):
+            with self.tracer.span("inner"):
+                pass
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "trace.json")
+            self.assertEqual(self.tracer.export_chrome_trace(path), 2)
+            with open(path) as f:
+                events = json.load(f)["traceEvents"]
+        inner, outer = events
+        self.assertEqual(outer["ph"], "X")
+        self.assertEqual(outer["args"], {"command": "['npm', '-v']"})
+        self.assertLessEqual(outer["ts"], inner["ts"])
+        self.assertGreaterEqual(outer["ts"] + outer["dur"], inner["ts"] + inner["dur"])
+
+    def test_histogram_aggregates_per_name(self):
+        self.tracer.enable()
+        for _ in range(5):
+            with self.tracer.span("step"):
+                pass
+        stats = self.tracer.histogram()["step"]
+        self.assertEqual(stats["count"], 5)
+        self.assertLessEqual(stats["min"], stats["p50"])
+        self.assertLessEqual(stats["p99"], stats["max"])
+        self.assertEqual(stats["buckets"]["60.0"], 5)
+        self.assertIn("step", self.tracer.format_histogram())
+
+if __name__ == '__main__':
+    unittest.main()
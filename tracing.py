@@ -0,0 +1,187 @@
+import os
+import json
+import time
+import threading
+import functools
+from collections import deque
+from metrics import DEFAULT_BUCKETS
+
+
+class _NullSpan:
+    """
+    Returned by Tracer.span while tracing is disabled. Entering and leaving it does nothing.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        # deque.append is atomic, so threads record spans without taking a lock
+        self.tracer._spans.append((self.name, self.start, end - self.start, threading.get_ident(), self.args))
+        return False
+
+
+class Tracer:
+    """
+    Collects timed spans of hot paths in memory.
+    While disabled, span() returns a shared no-op object and traced functions are called directly.
+    """
+
+    def __init__(self, max_spans=100000):
+        """
+        Initialize the Tracer.
+        :param max_spans: Number of spans kept; the oldest are dropped first.
+        """
+        self.enabled = False
+        self._spans = deque(maxlen=max_spans)  # (name, start_ns, duration_ns, thread id, args)
+        self._origin = time.perf_counter_ns()
+
+    def enable(self):
+        """
+        Start recording spans.
+        """
+        self.enabled = True
+
+    def disable(self):
+        """
+        Stop recording spans. Spans already collected are kept.
+        """
+        self.enabled = False
+
+    def clear(self):
+        """
+        Drop the collected spans.
+        """
+        self._spans.clear()
+        self._origin = time.perf_counter_ns()
+
+    def span(self, name, **args):
+        """
+        Time a block of code.
+        :param name: The span name. Spans with the same name are aggregated in the histogram.
+        :param args: Details attached to the span in the Chrome trace, e.g. a file path.
+        :return: A context manager.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def traced(self, name=None):
+        """
+        Decorator that records a span for every call of a function.
+        :param name: The span name. Defaults to the function's qualified name.
+        """
+        def decorator(function):
+            span_name = name or function.__qualname__
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                with _Span(self, span_name, {}):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def spans(self):
+        """
+        :return: A list of (name, start_ns, duration_ns, thread id, args) tuples in the order they finished.
+        """
+        return list(self._spans)
+
+    def chrome_trace(self):
+        """
+        Convert the spans to the Chrome trace-event format, viewable in chrome://tracing or Perfetto.
+        :return: A dictionary ready to be dumped as JSON.
+        """
+        pid = os.getpid()
+        events = []
+        for name, start, duration, thread_id, args in self.spans():
+            events.append({
+                "name": name,
+                "ph": "X",
+                "ts": (start - self._origin) / 1000,
+                "dur": duration / 1000,
+                "pid": pid,
+                "tid": thread_id,
+                "args": {key: str(value) for key, value in args.items()}
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path):
+        """
+        Write the spans to a Chrome trace-event JSON file.
+        :param path: The output path.
+        :return: The number of spans written.
+        """
+        trace = self.chrome_trace()
+        with open(path, "w") as f:
+            json.dump(trace, f)
+        return len(trace["traceEvents"])
+
+    def histogram(self):
+        """
+        Aggregate span latencies per name.
+        :return: A dictionary mapping span names to count, total, min, max, mean, p50, p95 and p99
+            in seconds, plus cumulative bucket counts for the metrics.DEFAULT_BUCKETS bounds.
+        """
+        durations = {}
+        for name, _, duration, _, _ in self.spans():
+            durations.setdefault(name, []).append(duration / 1e9)
+        summary = {}
+        for name, values in sorted(durations.items()):
+            values.sort()
+            count = len(values)
+            summary[name] = {
+                "count": count,
+                "total": sum(values),
+                "min": values[0],
+                "max": values[-1],
+                "mean": sum(values) / count,
+                "p50": _percentile(values, 0.50),
+                "p95": _percentile(values, 0.95),
+                "p99": _percentile(values, 0.99),
+                "buckets": {str(bound): sum(1 for value in values if value <= bound) for bound in DEFAULT_BUCKETS}
+            }
+        return summary
+
+    def format_histogram(self):
+        """
+        Format the per-span latency summary as a table.
+        :return: One line per span name.
+        """
+        lines = [f"{'span':<48} {'count':>7} {'mean ms':>10} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'max ms':>10}"]
+        for name, stats in self.histogram().items():
+            lines.append(f"{name:<48} {stats['count']:>7} " + " ".join(
+                f"{stats[key] * 1000:>10.3f}" for key in ("mean", "p50", "p95", "p99", "max")))
+        return "\n".join(lines)
+
+
+def _percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+# Global instance of the Tracer
+tracer = Tracer()